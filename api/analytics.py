@@ -0,0 +1,62 @@
+from typing import Any, Dict, Iterable
+
+from api.database import get_async_supabase_client
+
+def summarize_counts(rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    total = 0
+    satisfied = 0
+    open_items = 0
+    sentiments = {"positive": 0, "negative": 0, "neutral": 0}
+    urgencies = {"high": 0, "medium": 0, "low": 0}
+
+    for row in rows:
+        count = row["item_count"]
+        total += count
+        satisfied += row["satisfied_count"]
+        open_items += row["open_count"]
+
+        if row.get("sentiment") in sentiments:
+            sentiments[row["sentiment"]] += count
+        if row.get("urgency") in urgencies:
+            urgencies[row["urgency"]] += count
+
+    return {
+        "total_feedback": total,
+        "sentiment_distribution": sentiments,
+        "urgency_distribution": urgencies,
+        "satisfaction_rate": (satisfied / total * 100) if total > 0 else 0,
+        "open_items": open_items
+    }
+
+async def get_feedback_summary(tenant_id: str, start_date: str) -> Dict[str, Any]:
+    supabase = get_async_supabase_client()
+
+    response = await supabase.rpc("feedback_analytics_counts", {
+        "p_tenant_id": tenant_id,
+        "p_start_date": start_date
+    }).execute()
+
+    return summarize_counts(response.data or [])
+
+async def get_feedback_trends(tenant_id: str, start_date: str) -> Dict[str, Dict[str, int]]:
+    supabase = get_async_supabase_client()
+
+    response = await supabase.table("feedback_daily_rollups")\
+        .select("day, sentiment, item_count")\
+        .eq("tenant_id", tenant_id)\
+        .gte("day", start_date[:10])\
+        .order("day")\
+        .execute()
+
+    daily_data = {}
+    for row in response.data or []:
+        count = row["item_count"]
+        if not count:
+            continue
+
+        day = daily_data.setdefault(row["day"], {"positive": 0, "negative": 0, "neutral": 0, "total": 0})
+        if row["sentiment"] in ("positive", "negative", "neutral"):
+            day[row["sentiment"]] += count
+        day["total"] += count
+
+    return daily_data
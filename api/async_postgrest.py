@@ -0,0 +1,241 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+class APIError(Exception):
+    def __init__(self, message: str, status_code: int, details: Any = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.details = details
+
+class APIResponse:
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+def _format_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def _format_list(values: List[Any]) -> str:
+    formatted = []
+    for value in values:
+        value = _format_value(value)
+        if any(c in value for c in ',()"'):
+            value = '"' + value.replace('"', '\\"') + '"'
+        formatted.append(value)
+    return f"({','.join(formatted)})"
+
+class AsyncQueryBuilder:
+    def __init__(self, client: "AsyncPostgrestClient", path: str, method: str = "GET", body: Any = None):
+        self._client = client
+        self._path = path
+        self._method = method
+        self._body = body
+        self._params: List[Tuple[str, str]] = []
+        self._order: List[str] = []
+        self._prefer: List[str] = []
+        self._mode: Optional[str] = None
+        self._timeout: Optional[float] = None
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "AsyncQueryBuilder":
+        self._params.append(("select", "".join(columns.split())))
+        if count:
+            self._prefer.append(f"count={count}")
+        return self
+
+    def insert(self, rows: Union[Dict[str, Any], List[Dict[str, Any]]], returning: str = "representation") -> "AsyncQueryBuilder":
+        self._method = "POST"
+        self._body = rows
+        self._prefer.append(f"return={returning}")
+        return self
+
+    def upsert(
+        self,
+        rows: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: Optional[str] = None,
+        ignore_duplicates: bool = False,
+        returning: str = "representation"
+    ) -> "AsyncQueryBuilder":
+        self.insert(rows, returning)
+        self._prefer.append("resolution=ignore-duplicates" if ignore_duplicates else "resolution=merge-duplicates")
+        if on_conflict:
+            self._params.append(("on_conflict", on_conflict))
+        return self
+
+    def update(self, data: Dict[str, Any], returning: str = "representation") -> "AsyncQueryBuilder":
+        self._method = "PATCH"
+        self._body = data
+        self._prefer.append(f"return={returning}")
+        return self
+
+    def delete(self, returning: str = "representation") -> "AsyncQueryBuilder":
+        self._method = "DELETE"
+        self._prefer.append(f"return={returning}")
+        return self
+
+    def _filter(self, column: str, operator: str, value: Any) -> "AsyncQueryBuilder":
+        self._params.append((column, f"{operator}.{_format_value(value)}"))
+        return self
+
+    def eq(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "AsyncQueryBuilder":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "AsyncQueryBuilder":
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        return self._filter(column, "is", value)
+
+    def in_(self, column: str, values: List[Any]) -> "AsyncQueryBuilder":
+        self._params.append((column, f"in.{_format_list(values)}"))
+        return self
+
+    def or_(self, filters: str) -> "AsyncQueryBuilder":
+        self._params.append(("or", f"({filters})"))
+        return self
+
+    def order(self, column: str, desc: bool = False, nullsfirst: bool = False) -> "AsyncQueryBuilder":
+        self._order.append(f"{column}.{'desc' if desc else 'asc'}{'.nullsfirst' if nullsfirst else ''}")
+        return self
+
+    def limit(self, count: int) -> "AsyncQueryBuilder":
+        self._params.append(("limit", str(count)))
+        return self
+
+    def offset(self, count: int) -> "AsyncQueryBuilder":
+        self._params.append(("offset", str(count)))
+        return self
+
+    def range(self, start: int, end: int) -> "AsyncQueryBuilder":
+        return self.offset(start).limit(end - start + 1)
+
+    def single(self) -> "AsyncQueryBuilder":
+        self._mode = "single"
+        return self
+
+    def maybe_single(self) -> "AsyncQueryBuilder":
+        self._mode = "maybe_single"
+        return self
+
+    maybeSingle = maybe_single
+
+    def timeout(self, seconds: float) -> "AsyncQueryBuilder":
+        self._timeout = seconds
+        return self
+
+    async def execute(self) -> APIResponse:
+        params = list(self._params)
+        if self._order:
+            params.append(("order", ",".join(self._order)))
+        if self._mode and self._method == "GET" and not any(key == "limit" for key, _ in params):
+            params.append(("limit", "2"))
+
+        headers = {}
+        if self._prefer:
+            headers["Prefer"] = ",".join(self._prefer)
+
+        request_kwargs: Dict[str, Any] = {"params": params, "headers": headers}
+        if self._body is not None:
+            request_kwargs["content"] = json.dumps(self._body, default=str)
+            headers["Content-Type"] = "application/json"
+        if self._timeout is not None:
+            request_kwargs["timeout"] = self._timeout
+
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._client.http.request(self._method, self._path, **request_kwargs)
+            status = str(response.status_code)
+        finally:
+            if self._client.on_request is not None:
+                self._client.on_request(self._method, self._path, status, time.perf_counter() - started)
+
+        if response.status_code >= 400:
+            try:
+                details = response.json()
+                message = details.get("message") or response.text
+            except ValueError:
+                details = None
+                message = response.text
+            raise APIError(message, response.status_code, details)
+
+        data = response.json() if response.content else None
+
+        count = None
+        content_range = response.headers.get("content-range")
+        if content_range and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1]
+            count = int(total) if total.isdigit() else None
+
+        if self._mode and isinstance(data, list):
+            if len(data) > 1:
+                raise APIError("Multiple rows returned for a single-row query", 406)
+            if not data and self._mode == "single":
+                raise APIError("No rows returned for a single-row query", 406)
+            data = data[0] if data else None
+
+        return APIResponse(data, count)
+
+class AsyncPostgrestClient:
+    def __init__(
+        self,
+        supabase_url: str,
+        supabase_key: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        on_request: Optional[Callable[[str, str, str, float], None]] = None
+    ):
+        self.on_request = on_request
+        self.http = httpx.AsyncClient(
+            base_url=f"{supabase_url.rstrip('/')}/rest/v1",
+            headers={
+                "apikey": supabase_key,
+                "Authorization": f"Bearer {supabase_key}",
+                "Accept": "application/json"
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(timeout),
+            transport=transport
+        )
+
+    def table(self, name: str) -> AsyncQueryBuilder:
+        return AsyncQueryBuilder(self, f"/{name}")
+
+    from_ = table
+
+    def rpc(self, function: str, params: Optional[Dict[str, Any]] = None) -> AsyncQueryBuilder:
+        return AsyncQueryBuilder(self, f"/rpc/{function}", method="POST", body=params or {})
+
+    async def aclose(self):
+        await self.http.aclose()
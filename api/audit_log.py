@@ -0,0 +1,88 @@
+import asyncio
+import os
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+AUDIT_LOG_BATCH_MAX_ROWS = int(os.getenv("AUDIT_LOG_BATCH_MAX_ROWS", "200"))
+AUDIT_LOG_BATCH_MAX_WAIT_MS = int(os.getenv("AUDIT_LOG_BATCH_MAX_WAIT_MS", "1000"))
+AUDIT_LOG_MAX_PENDING = int(os.getenv("AUDIT_LOG_MAX_PENDING", "10000"))
+AUDIT_LOG_OVERFLOW = os.getenv("AUDIT_LOG_OVERFLOW", "drop_oldest")
+
+AUDIT_LOG_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+class AuditLogBuffer:
+    def __init__(
+        self,
+        insert: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+        max_rows: int = AUDIT_LOG_BATCH_MAX_ROWS,
+        max_wait_ms: int = AUDIT_LOG_BATCH_MAX_WAIT_MS,
+        max_pending: int = AUDIT_LOG_MAX_PENDING,
+        overflow: str = AUDIT_LOG_OVERFLOW
+    ):
+        if overflow not in AUDIT_LOG_OVERFLOW_POLICIES:
+            raise Exception(f"Unknown audit log overflow policy: {overflow}")
+
+        self.insert = insert
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.flushed = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def record(self, event: Dict[str, Any]):
+        if len(self._pending) + self._in_flight >= self.max_pending:
+            self.dropped += 1
+            if self.overflow == "drop_newest" or not self._pending:
+                return
+            self._pending.popleft()
+
+        self._pending.append(event)
+
+        if len(self._pending) >= self.max_rows:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush_pending)
+
+    def _flush_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.max_rows, len(self._pending)))]
+            self._in_flight += len(batch)
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        try:
+            await self.insert(batch)
+            self.flushed += len(batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            self.dropped += len(batch)
+            print(f"Failed to write {len(batch)} audit events: {str(e)}")
+        finally:
+            self._in_flight -= len(batch)
+
+    async def close(self):
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "in_flight": self._in_flight,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "overflow": self.overflow
+        }
@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from api.cache import LRUCache
+from api.sentiment_engine import PhraseMatcher, analyze_text, get_default_matcher
+from api.sentiment_model import SentimentModel, analyze_with_model
+
+CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "50000"))
+CLASSIFICATION_CACHE_TTL_SECONDS = int(os.getenv("CLASSIFICATION_CACHE_TTL_SECONDS", "86400"))
+CLASSIFICATION_CACHE_REDIS_URL = os.getenv("CLASSIFICATION_CACHE_REDIS_URL")
+
+class ClassificationCache:
+    def __init__(
+        self,
+        maxsize: int = CLASSIFICATION_CACHE_SIZE,
+        ttl: int = CLASSIFICATION_CACHE_TTL_SECONDS,
+        redis_url: Optional[str] = CLASSIFICATION_CACHE_REDIS_URL,
+        prefix: str = "awakenu:classification"
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local = LRUCache(maxsize, ttl)
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self._redis = None
+
+        if redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+
+    def key(self, text: str, matcher: PhraseMatcher, model: Optional[SentimentModel] = None) -> str:
+        digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        version = f"{matcher.version}+{model.version}" if model else matcher.version
+        return f"{version}:{digest}"
+
+    async def analyze(
+        self,
+        text: str,
+        matcher: Optional[PhraseMatcher] = None,
+        model: Optional[SentimentModel] = None
+    ) -> Dict[str, Any]:
+        matcher = matcher or get_default_matcher()
+        key = self.key(text, matcher, model)
+
+        result = self._local.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(f"{self.prefix}:{key}")
+            except Exception as e:
+                print(f"Classification cache read failed: {str(e)}")
+                cached = None
+
+            if cached is not None:
+                result = json.loads(cached)
+                self._local.set(key, result)
+                self.redis_hits += 1
+                self.hits += 1
+                return result
+
+        self.misses += 1
+        result = analyze_with_model(text, model, matcher) if model else analyze_text(text, matcher)
+        self._local.set(key, result)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"{self.prefix}:{key}", json.dumps(result), ex=self.ttl)
+            except Exception as e:
+                print(f"Classification cache write failed: {str(e)}")
+
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+
+        return {
+            "size": len(self._local),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+_classification_cache: Optional[ClassificationCache] = None
+
+def get_classification_cache() -> ClassificationCache:
+    global _classification_cache
+    if _classification_cache is None:
+        _classification_cache = ClassificationCache()
+
+    return _classification_cache
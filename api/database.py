@@ -1,13 +1,35 @@
+import asyncio
 import os
+import time
 from supabase import create_client, Client
 from fastapi import Header, HTTPException
-from typing import Optional, Dict, Any
+from jose import jwt
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from dotenv import load_dotenv
 
+from api.async_postgrest import AsyncPostgrestClient
+from api.audit_log import AuditLogBuffer
+from api.cache import LRUCache
+from api.metrics import METRICS_ENABLED, observe_supabase_request
+
 load_dotenv()
 
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_CACHE_TTL_SECONDS = float(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "300"))
+AUTH_TENANT_CACHE_SIZE = int(os.getenv("AUTH_TENANT_CACHE_SIZE", "10000"))
+AUTH_TENANT_CACHE_TTL_SECONDS = float(os.getenv("AUTH_TENANT_CACHE_TTL_SECONDS", "60"))
+SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "100"))
+SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "10"))
+
 _supabase_client: Optional[Client] = None
+_async_supabase_client: Optional[AsyncPostgrestClient] = None
+_audit_log_buffer: Optional[AuditLogBuffer] = None
+_token_cache = LRUCache(AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_CACHE_TTL_SECONDS)
+_tenant_cache = LRUCache(AUTH_TENANT_CACHE_SIZE, AUTH_TENANT_CACHE_TTL_SECONDS)
 
 def get_supabase_client() -> Client:
     global _supabase_client
@@ -22,26 +44,75 @@ def get_supabase_client() -> Client:
 
     return _supabase_client
 
+def get_async_supabase_client() -> AsyncPostgrestClient:
+    global _async_supabase_client
+    if _async_supabase_client is None:
+        supabase_url = os.getenv("VITE_SUPABASE_URL")
+        supabase_key = os.getenv("VITE_SUPABASE_ANON_KEY")
+
+        if not supabase_url or not supabase_key:
+            raise Exception("Supabase credentials not found")
+
+        _async_supabase_client = AsyncPostgrestClient(
+            supabase_url,
+            supabase_key,
+            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY,
+            timeout=SUPABASE_TIMEOUT_SECONDS,
+            on_request=observe_supabase_request if METRICS_ENABLED else None
+        )
+
+    return _async_supabase_client
+
+async def close_async_supabase_client():
+    global _async_supabase_client
+    if _async_supabase_client is not None:
+        await _async_supabase_client.aclose()
+        _async_supabase_client = None
+
 async def get_current_user(authorization: str = Header(None)) -> str:
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
 
     token = authorization.split(" ")[1]
-    supabase = get_supabase_client()
 
-    try:
-        user_response = supabase.auth.get_user(token)
-        if not user_response or not user_response.user:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    user_id = _token_cache.get(token)
+    if user_id:
+        return user_id
 
-        return user_response.user.id
+    try:
+        if SUPABASE_JWT_SECRET:
+            claims = jwt.decode(token, SUPABASE_JWT_SECRET, algorithms=["HS256"], audience="authenticated")
+            user_id = claims.get("sub")
+            if not user_id:
+                raise HTTPException(status_code=401, detail="Invalid token")
+        else:
+            supabase = get_supabase_client()
+            user_response = await asyncio.to_thread(supabase.auth.get_user, token)
+            if not user_response or not user_response.user:
+                raise HTTPException(status_code=401, detail="Invalid token")
+
+            user_id = user_response.user.id
+            claims = jwt.get_unverified_claims(token)
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
 
+    expires_at = time.time() + AUTH_TOKEN_CACHE_TTL_SECONDS
+    if claims.get("exp"):
+        expires_at = min(expires_at, float(claims["exp"]))
+    _token_cache.set(token, user_id, expires_at=expires_at)
+
+    return user_id
+
 async def get_user_tenant(user_id: str) -> str:
-    supabase = get_supabase_client()
+    tenant_id = _tenant_cache.get(user_id)
+    if tenant_id:
+        return tenant_id
 
-    response = supabase.table("tenant_users")\
+    supabase = get_async_supabase_client()
+
+    response = await supabase.table("tenant_users")\
         .select("tenant_id")\
         .eq("user_id", user_id)\
         .eq("is_active", True)\
@@ -51,12 +122,23 @@ async def get_user_tenant(user_id: str) -> str:
     if not response.data:
         raise HTTPException(status_code=403, detail="User not associated with any tenant")
 
+    _tenant_cache.set(user_id, response.data["tenant_id"])
+
     return response.data["tenant_id"]
 
+def invalidate_user_tenant(user_id: str):
+    _tenant_cache.invalidate(user_id)
+
+def auth_cache_stats() -> Dict[str, Any]:
+    return {
+        "tokens": _token_cache.stats(),
+        "tenants": _tenant_cache.stats()
+    }
+
 async def verify_tenant_access(user_id: str, tenant_id: str) -> bool:
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
 
-    response = supabase.table("tenant_users")\
+    response = await supabase.table("tenant_users")\
         .select("id")\
         .eq("user_id", user_id)\
         .eq("tenant_id", tenant_id)\
@@ -66,7 +148,18 @@ async def verify_tenant_access(user_id: str, tenant_id: str) -> bool:
 
     return response.data is not None
 
-async def log_audit_event(
+async def insert_audit_events(events: List[Dict[str, Any]]):
+    supabase = get_async_supabase_client()
+    await supabase.table("audit_logs").insert(events, returning="minimal").execute()
+
+def get_audit_log_buffer() -> AuditLogBuffer:
+    global _audit_log_buffer
+    if _audit_log_buffer is None:
+        _audit_log_buffer = AuditLogBuffer(insert_audit_events)
+
+    return _audit_log_buffer
+
+def log_audit_event(
     tenant_id: str,
     user_id: str,
     action: str,
@@ -74,18 +167,14 @@ async def log_audit_event(
     resource_type: Optional[str] = None,
     resource_id: Optional[str] = None
 ):
-    supabase = get_supabase_client()
-
     audit_data = {
         "tenant_id": tenant_id,
         "user_id": user_id,
         "action": action,
         "resource_type": resource_type,
         "resource_id": resource_id,
-        "metadata": metadata
+        "metadata": metadata,
+        "created_at": datetime.utcnow().isoformat()
     }
 
-    try:
-        supabase.table("audit_logs").insert(audit_data).execute()
-    except Exception as e:
-        print(f"Failed to log audit event: {str(e)}")
+    get_audit_log_buffer().record(audit_data)
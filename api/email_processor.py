@@ -1,21 +1,21 @@
 from typing import Dict, Any
-import html2text
 import re
 from datetime import datetime
-from api.sentiment_engine import classify_sentiment, detect_urgency, classify_intent, calculate_priority
-from api.database import get_supabase_client
+from api.async_postgrest import APIError
+from api.email_text import email_bodies, EMAIL_MAX_ANALYSIS_CHARS
+from api.email_threads import parse_thread_headers, content_hash, is_duplicate, remember_message, attach_reply
+from api.classification_cache import get_classification_cache
+from api.tenant_lexicons import get_tenant_lexicons
+from api.sentiment_model import get_tenant_model
+from api.feedback_writer import get_feedback_writer, insert_missing_alert
+from api.integration_router import get_integration_router
+from api.realtime import publish_feedback_created, publish_alert_created
+from api.response_cache import get_response_cache
+from api.metrics import ingest_stage, count_ingest
 
 def normalize_email(raw_email: Dict[str, Any]) -> Dict[str, Any]:
-    h = html2text.HTML2Text()
-    h.ignore_links = False
-
-    body_text = raw_email.get("text", "")
     body_html = raw_email.get("html", "")
-
-    if not body_text and body_html:
-        body_text = h.handle(body_html)
-
-    body_text = body_text.strip()
+    body_text, new_text = email_bodies(raw_email.get("text", ""), body_html)
 
     sender_email = raw_email.get("from", "")
     sender_name = None
@@ -25,52 +25,80 @@ def normalize_email(raw_email: Dict[str, Any]) -> Dict[str, Any]:
             sender_name = match.group(1).strip()
             sender_email = match.group(2).strip()
 
+    subject = raw_email.get("subject", "(No Subject)")
+    thread = parse_thread_headers(raw_email.get("headers"))
+
     return {
-        "subject": raw_email.get("subject", "(No Subject)"),
+        "subject": subject,
         "body_text": body_text,
+        "new_text": new_text,
         "body_html": body_html,
         "sender_email": sender_email,
         "sender_name": sender_name,
         "recipient_email": raw_email.get("to", ""),
         "to_addresses": [raw_email.get("to", "")],
         "cc_addresses": [],
+        "message_id": thread["message_id"],
+        "in_reply_to": thread["in_reply_to"],
+        "references": thread["references"],
+        "content_hash": None if thread["message_id"] else content_hash(sender_email, subject, body_text),
         "metadata": {
             "headers": raw_email.get("headers", {}),
-            "attachments_count": raw_email.get("attachments", 0)
+            "attachments_count": raw_email.get("attachments", 0),
+            "attachments": raw_email.get("attachment_info", []),
+            "truncated_fields": raw_email.get("truncated_fields", [])
         }
     }
 
 async def process_inbound_email(email_data: Dict[str, Any], provider: str):
+    with get_feedback_writer().producer():
+        await _process_inbound_email(email_data, provider)
+
+async def _process_inbound_email(email_data: Dict[str, Any], provider: str):
     try:
-        canonical = normalize_email(email_data)
-
-        text_for_analysis = f"{canonical['subject']} {canonical['body_text']}"
-
-        sentiment_result = classify_sentiment(text_for_analysis)
-        urgency_result = detect_urgency(text_for_analysis)
-        intent_result = classify_intent(text_for_analysis)
-        priority = calculate_priority(
-            sentiment_result["score"],
-            urgency_result["label"],
-            sentiment_result["label"]
-        )
-
-        supabase = get_supabase_client()
-
-        integration = supabase.table("email_integrations")\
-            .select("id, tenant_id")\
-            .eq("provider", provider)\
-            .eq("is_active", True)\
-            .maybeSingle()\
-            .execute()
-
-        if not integration.data:
-            print(f"No active integration found for provider: {provider}")
+        with ingest_stage("normalize"):
+            canonical = normalize_email(email_data)
+
+        with ingest_stage("route"):
+            integration = await get_integration_router().resolve(provider, canonical["recipient_email"])
+
+        if not integration:
+            count_ingest("unrouted")
+            print(f"No active integration found for provider: {provider}, recipient: {canonical['recipient_email']}")
             return
 
+        tenant_id = integration["tenant_id"]
+
+        with ingest_stage("dedupe"):
+            duplicate = is_duplicate(tenant_id, canonical)
+            feedback_id = None if duplicate else await attach_reply(tenant_id, canonical)
+
+        if duplicate:
+            count_ingest("duplicate")
+            print(f"Skipped duplicate email: {canonical['message_id'] or canonical['content_hash']}")
+            return
+
+        if feedback_id:
+            remember_message(tenant_id, canonical)
+            await get_response_cache().invalidate(tenant_id, "feedback")
+            count_ingest("reply")
+            print(f"Attached reply to feedback {feedback_id}: {canonical['subject']}")
+            return
+
+        text_for_analysis = f"{canonical['subject']} {canonical['new_text']}"[:EMAIL_MAX_ANALYSIS_CHARS]
+
+        with ingest_stage("classify"):
+            matcher = await get_tenant_lexicons().matcher(tenant_id)
+            model = await get_tenant_model(tenant_id)
+            analysis = await get_classification_cache().analyze(text_for_analysis, matcher, model)
+        sentiment_result = analysis["sentiment"]
+        urgency_result = analysis["urgency"]
+        intent_result = analysis["intent"]
+        priority = analysis["priority"]
+
         feedback_data = {
-            "tenant_id": integration.data["tenant_id"],
-            "integration_id": integration.data["id"],
+            "tenant_id": tenant_id,
+            "integration_id": integration["id"],
             "source": "email",
             "channel": "email",
             "subject": canonical["subject"],
@@ -81,6 +109,8 @@ async def process_inbound_email(email_data: Dict[str, Any], provider: str):
             "recipient_email": canonical["recipient_email"],
             "to_addresses": canonical["to_addresses"],
             "cc_addresses": canonical["cc_addresses"],
+            "message_id": canonical["message_id"],
+            "content_hash": canonical["content_hash"],
             "sentiment": sentiment_result["label"],
             "sentiment_score": sentiment_result["score"],
             "urgency": urgency_result["label"],
@@ -93,19 +123,42 @@ async def process_inbound_email(email_data: Dict[str, Any], provider: str):
             "processed_at": datetime.utcnow().isoformat()
         }
 
-        result = supabase.table("feedback_items").insert(feedback_data).execute()
-
+        alert_data = None
         if urgency_result["label"] == "high" and sentiment_result["label"] == "negative":
-            supabase.table("alerts").insert({
-                "tenant_id": integration.data["tenant_id"],
-                "feedback_id": result.data[0]["id"],
+            alert_data = {
+                "tenant_id": tenant_id,
                 "alert_type": "high_priority",
                 "severity": "high",
                 "message": f"High priority feedback from {canonical['sender_email']}"
-            }).execute()
+            }
+
+        try:
+            with ingest_stage("insert"):
+                row = await get_feedback_writer().write(feedback_data, alert_data)
+        except APIError as e:
+            if e.status_code != 409:
+                raise
+            if alert_data:
+                feedback_id = await insert_missing_alert(tenant_id, canonical, alert_data)
+                if feedback_id:
+                    await publish_alert_created(tenant_id, feedback_id, alert_data)
+            remember_message(tenant_id, canonical)
+            count_ingest("duplicate")
+            print(f"Skipped duplicate email: {canonical['message_id'] or canonical['content_hash']}")
+            return
+
+        remember_message(tenant_id, canonical)
+
+        with ingest_stage("publish"):
+            await get_response_cache().invalidate(tenant_id, "analytics")
+            await publish_feedback_created(tenant_id, row)
+            if alert_data:
+                await publish_alert_created(tenant_id, row["id"], alert_data)
 
+        count_ingest("processed")
         print(f"Processed email: {canonical['subject']} - Sentiment: {sentiment_result['label']}, Urgency: {urgency_result['label']}")
 
     except Exception as e:
+        count_ingest("failed")
         print(f"Error processing email: {str(e)}")
         raise
@@ -0,0 +1,273 @@
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from api.metrics import count_email_job
+
+EMAIL_QUEUE_BACKEND = os.getenv("EMAIL_QUEUE_BACKEND", "memory")
+EMAIL_QUEUE_MAXSIZE = int(os.getenv("EMAIL_QUEUE_MAXSIZE", "10000"))
+EMAIL_QUEUE_CONCURRENCY = int(os.getenv("EMAIL_QUEUE_CONCURRENCY", "200"))
+EMAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("EMAIL_QUEUE_MAX_ATTEMPTS", "5"))
+EMAIL_QUEUE_BACKOFF_SECONDS = float(os.getenv("EMAIL_QUEUE_BACKOFF_SECONDS", "2"))
+EMAIL_QUEUE_DEAD_LETTER_LIMIT = int(os.getenv("EMAIL_QUEUE_DEAD_LETTER_LIMIT", "10000"))
+EMAIL_QUEUE_LEASE_SECONDS = float(os.getenv("EMAIL_QUEUE_LEASE_SECONDS", "60"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+Handler = Callable[[Dict[str, Any], str], Awaitable[Any]]
+
+class QueueFullError(Exception):
+    pass
+
+def new_job(email_data: Dict[str, Any], provider: str) -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "provider": provider,
+        "email": email_data,
+        "attempts": 0,
+        "enqueued_at": time.time()
+    }
+
+def backoff_delay(attempts: int) -> float:
+    return EMAIL_QUEUE_BACKOFF_SECONDS * (2 ** (attempts - 1))
+
+class MemoryEmailQueue:
+    def __init__(self, maxsize: int = EMAIL_QUEUE_MAXSIZE, dead_letter_limit: int = EMAIL_QUEUE_DEAD_LETTER_LIMIT):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dead_letters: deque = deque(maxlen=dead_letter_limit)
+
+    async def enqueue(self, job: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Inbound email queue is full")
+
+    async def dequeue(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        try:
+            job = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        return None, job
+
+    async def ack(self, token: Any, job: Dict[str, Any]):
+        pass
+
+    async def retry(self, token: Any, job: Dict[str, Any], delay: float):
+        asyncio.get_running_loop().call_later(delay, self._requeue, job)
+
+    def _requeue(self, job: Dict[str, Any]):
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.dead_letters.append({**job, "error": "Queue full on retry", "failed_at": time.time()})
+
+    async def dead_letter(self, token: Any, job: Dict[str, Any], error: str):
+        self.dead_letters.append({**job, "error": error, "failed_at": time.time()})
+
+    async def promote_due(self) -> int:
+        return 0
+
+    async def heartbeat(self):
+        pass
+
+    async def requeue_processing(self) -> int:
+        return 0
+
+    async def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def close(self):
+        pass
+
+class RedisEmailQueue:
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        prefix: str = "awakenu:email_queue",
+        maxsize: int = EMAIL_QUEUE_MAXSIZE,
+        dead_letter_limit: int = EMAIL_QUEUE_DEAD_LETTER_LIMIT,
+        lease_seconds: float = EMAIL_QUEUE_LEASE_SECONDS
+    ):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(url, decode_responses=True)
+        self.maxsize = maxsize
+        self.dead_letter_limit = dead_letter_limit
+        self.lease_seconds = lease_seconds
+        self.prefix = prefix
+        self.consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.pending_key = f"{prefix}:pending"
+        self.processing_key = self._processing_key(self.consumer_id)
+        self.consumers_key = f"{prefix}:consumers"
+        self.delayed_key = f"{prefix}:delayed"
+        self.dead_key = f"{prefix}:dead"
+        self._last_heartbeat = 0.0
+
+    def _processing_key(self, consumer_id: str) -> str:
+        return f"{self.prefix}:processing:{consumer_id}"
+
+    async def enqueue(self, job: Dict[str, Any]):
+        if self.maxsize and await self._redis.llen(self.pending_key) >= self.maxsize:
+            raise QueueFullError("Inbound email queue is full")
+
+        await self._redis.lpush(self.pending_key, json.dumps(job))
+
+    async def dequeue(self, timeout: float) -> Optional[Tuple[Any, Dict[str, Any]]]:
+        await self.heartbeat()
+        raw = await self._redis.blmove(self.pending_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+
+        return raw, json.loads(raw)
+
+    async def ack(self, token: Any, job: Dict[str, Any]):
+        await self._redis.lrem(self.processing_key, 1, token)
+
+    async def retry(self, token: Any, job: Dict[str, Any], delay: float):
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key, 1, token)
+            pipe.zadd(self.delayed_key, {json.dumps(job): time.time() + delay})
+            await pipe.execute()
+
+    async def dead_letter(self, token: Any, job: Dict[str, Any], error: str):
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key, 1, token)
+            pipe.lpush(self.dead_key, json.dumps({**job, "error": error, "failed_at": time.time()}))
+            pipe.ltrim(self.dead_key, 0, self.dead_letter_limit - 1)
+            await pipe.execute()
+
+    async def promote_due(self) -> int:
+        due = await self._redis.zrangebyscore(self.delayed_key, "-inf", time.time(), start=0, num=100)
+
+        moved = 0
+        for raw in due:
+            if await self._redis.zrem(self.delayed_key, raw):
+                await self._redis.lpush(self.pending_key, raw)
+                moved += 1
+
+        return moved
+
+    async def heartbeat(self):
+        now = time.time()
+        if now - self._last_heartbeat >= 1:
+            self._last_heartbeat = now
+            await self._redis.zadd(self.consumers_key, {self.consumer_id: now})
+
+    async def _requeue_consumer(self, consumer_id: str) -> int:
+        key = self._processing_key(consumer_id)
+        moved = 0
+        while await self._redis.lmove(key, self.pending_key, "RIGHT", "LEFT") is not None:
+            moved += 1
+
+        await self._redis.zrem(self.consumers_key, consumer_id)
+        return moved
+
+    async def requeue_processing(self) -> int:
+        expired = await self._redis.zrangebyscore(self.consumers_key, "-inf", time.time() - self.lease_seconds)
+
+        moved = 0
+        for consumer_id in expired:
+            if consumer_id != self.consumer_id:
+                moved += await self._requeue_consumer(consumer_id)
+
+        return moved
+
+    async def depth(self) -> int:
+        return await self._redis.llen(self.pending_key)
+
+    async def close(self):
+        await self._requeue_consumer(self.consumer_id)
+        await self._redis.aclose()
+
+_email_queue = None
+
+def get_email_queue():
+    global _email_queue
+    if _email_queue is None:
+        if EMAIL_QUEUE_BACKEND == "memory":
+            _email_queue = MemoryEmailQueue()
+        elif EMAIL_QUEUE_BACKEND == "redis":
+            _email_queue = RedisEmailQueue()
+        else:
+            raise Exception(f"Unknown email queue backend: {EMAIL_QUEUE_BACKEND}")
+
+    return _email_queue
+
+class EmailWorkerPool:
+    def __init__(
+        self,
+        queue,
+        handler: Handler,
+        concurrency: int = EMAIL_QUEUE_CONCURRENCY,
+        max_attempts: int = EMAIL_QUEUE_MAX_ATTEMPTS
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._promote()))
+
+    async def stop(self, timeout: float = 30.0):
+        self._stopping.set()
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _consume(self):
+        while not self._stopping.is_set():
+            try:
+                item = await self.queue.dequeue(timeout=1)
+            except Exception as e:
+                print(f"Failed to dequeue email job: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+
+            if item is None:
+                continue
+
+            token, job = item
+            try:
+                await self.handler(job["email"], job["provider"])
+            except Exception as e:
+                job["attempts"] += 1
+                if job["attempts"] >= self.max_attempts:
+                    count_email_job("dead_lettered")
+                    print(f"Email job {job['id']} failed after {job['attempts']} attempts: {str(e)}")
+                    await self.queue.dead_letter(token, job, str(e))
+                else:
+                    count_email_job("retried")
+                    await self.queue.retry(token, job, backoff_delay(job["attempts"]))
+            else:
+                count_email_job("completed")
+                await self.queue.ack(token, job)
+
+    async def _promote(self):
+        last_requeue = 0.0
+        while not self._stopping.is_set():
+            try:
+                await self.queue.heartbeat()
+                await self.queue.promote_due()
+                if time.time() - last_requeue >= EMAIL_QUEUE_LEASE_SECONDS:
+                    last_requeue = time.time()
+                    moved = await self.queue.requeue_processing()
+                    if moved:
+                        print(f"Requeued {moved} email jobs from workers whose lease expired")
+            except Exception as e:
+                print(f"Failed to promote delayed email jobs: {str(e)}")
+            await asyncio.sleep(1)
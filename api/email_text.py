@@ -0,0 +1,146 @@
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+EMAIL_MAX_HTML_CHARS = int(os.getenv("EMAIL_MAX_HTML_CHARS", "2000000"))
+EMAIL_MAX_BODY_CHARS = int(os.getenv("EMAIL_MAX_BODY_CHARS", "100000"))
+EMAIL_MAX_ANALYSIS_CHARS = int(os.getenv("EMAIL_MAX_ANALYSIS_CHARS", "20000"))
+HTML_FEED_CHUNK_CHARS = 64 * 1024
+SIGNATURE_MAX_LINES = 15
+
+SKIPPED_TAGS = {"head", "title", "script", "style", "noscript", "template", "svg", "object"}
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "tr", "table", "ul", "ol", "pre", "hr", "section", "article",
+    "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "dt", "dd", "center", "blockquote"
+}
+QUOTE_CLASSES = {"gmail_quote", "gmail_signature", "yahoo_quoted", "moz-cite-prefix", "moz-signature"}
+REPLY_HEADER_IDS = {"appendonsend", "divrplyfwdmsg", "mail-editor-reference-message-container"}
+
+_data_uri_re = re.compile(r"data:[\w/+.-]*;base64,[A-Za-z0-9+/=\s]*", re.IGNORECASE)
+_inline_space_re = re.compile(r"[ \t\r\f\v\xa0]+")
+_blank_lines_re = re.compile(r"\n{3,}")
+_reply_header_re = re.compile(r"^(on .{0,300} wrote:|-{2,}\s*original message\s*-{2,}|-{2,}\s*forwarded message\s*-{2,})$", re.IGNORECASE)
+_mobile_signature_re = re.compile(r"^sent from my \w+", re.IGNORECASE)
+
+class _TextCollector:
+    def __init__(self):
+        self.reset(EMAIL_MAX_BODY_CHARS)
+
+    def reset(self, max_chars: int):
+        self.max_chars = max_chars
+        self.parts: List[str] = []
+        self.length = 0
+        self.skip_depth = 0
+        self.reply_at: Optional[int] = None
+
+    @property
+    def full(self) -> bool:
+        return self.length >= self.max_chars
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+
+        classes = set((attrib.get("class") or "").split())
+        if self.reply_at is None and (
+            tag == "blockquote" or classes & QUOTE_CLASSES or (attrib.get("id") or "").lower() in REPLY_HEADER_IDS
+        ):
+            self.reply_at = self.length
+
+        if tag in SKIPPED_TAGS:
+            self.skip_depth = 1
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def end(self, tag: str):
+        if self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._append("\n")
+
+    def data(self, text: str):
+        if not self.skip_depth:
+            self._append(text)
+
+    def _append(self, text: str):
+        if not self.full:
+            self.parts.append(text)
+            self.length += len(text)
+
+    def close(self) -> str:
+        return "".join(self.parts)[:self.max_chars]
+
+_local = threading.local()
+
+def _get_parser():
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        _local.collector = _TextCollector()
+        _local.parser = parser = etree.HTMLParser(target=_local.collector, no_network=True)
+
+    return parser, _local.collector
+
+def clean_whitespace(text: str) -> str:
+    lines = (_inline_space_re.sub(" ", line).strip() for line in text.split("\n"))
+    return _blank_lines_re.sub("\n\n", "\n".join(lines)).strip()
+
+def _parse_html(html: str, max_chars: int, max_html_chars: int) -> Tuple[str, Optional[int]]:
+    html = _data_uri_re.sub("", html[:max_html_chars])
+    parser, collector = _get_parser()
+    collector.reset(max_chars)
+
+    try:
+        for offset in range(0, len(html), HTML_FEED_CHUNK_CHARS):
+            parser.feed(html[offset:offset + HTML_FEED_CHUNK_CHARS])
+            if collector.full:
+                break
+    finally:
+        try:
+            text = parser.close()
+        except etree.LxmlError:
+            text = collector.close()
+
+    return text, collector.reply_at
+
+def html_to_text(html: str, max_chars: int = EMAIL_MAX_BODY_CHARS, max_html_chars: int = EMAIL_MAX_HTML_CHARS) -> str:
+    return clean_whitespace(_parse_html(html, max_chars, max_html_chars)[0])
+
+def strip_reply_text(text: str) -> str:
+    kept = []
+    lines = text.split("\n")
+    signature_from = len(lines) - SIGNATURE_MAX_LINES
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+
+        if i >= signature_from and (line.rstrip() == "--" or _mobile_signature_re.match(stripped)):
+            break
+        if _reply_header_re.match(stripped):
+            break
+        if stripped.startswith("From:") and any(l.strip().startswith("Sent:") for l in lines[i + 1:i + 4]):
+            break
+        if stripped.startswith(">"):
+            continue
+
+        kept.append(line)
+
+    return "\n".join(kept).strip() or text.strip()
+
+def email_bodies(text: Optional[str], html: Optional[str], max_chars: int = EMAIL_MAX_BODY_CHARS) -> Tuple[str, str]:
+    if text:
+        body = clean_whitespace(text[:max_chars])
+        return body, strip_reply_text(body)
+
+    if not html:
+        return "", ""
+
+    raw, reply_at = _parse_html(html, max_chars, EMAIL_MAX_HTML_CHARS)
+    body = clean_whitespace(raw)
+    if reply_at is not None:
+        raw = raw[:reply_at]
+
+    return body, strip_reply_text(clean_whitespace(raw)) or body
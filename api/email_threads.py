@@ -0,0 +1,80 @@
+import hashlib
+import os
+import re
+from email.parser import HeaderParser
+from typing import Any, Dict, List, Optional, Union
+
+from api.cache import LRUCache
+from api.database import get_async_supabase_client
+
+EMAIL_DEDUPE_CACHE_SIZE = int(os.getenv("EMAIL_DEDUPE_CACHE_SIZE", "50000"))
+EMAIL_DEDUPE_CACHE_TTL_SECONDS = float(os.getenv("EMAIL_DEDUPE_CACHE_TTL_SECONDS", "86400"))
+
+_message_id_re = re.compile(r"<[^<>\s]+>")
+_whitespace_re = re.compile(r"\s+")
+
+_seen_messages = LRUCache(EMAIL_DEDUPE_CACHE_SIZE, EMAIL_DEDUPE_CACHE_TTL_SECONDS)
+
+def _message_ids(value: Optional[str]) -> List[str]:
+    return [match.lower() for match in _message_id_re.findall(value or "")]
+
+def parse_thread_headers(raw_headers: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    if isinstance(raw_headers, dict):
+        headers = {key.lower(): str(value) for key, value in raw_headers.items()}
+    else:
+        parsed = HeaderParser().parsestr(raw_headers or "", headersonly=True)
+        headers = {key.lower(): value for key, value in parsed.items()}
+
+    message_ids = _message_ids(headers.get("message-id"))
+    in_reply_to = _message_ids(headers.get("in-reply-to"))
+    references = _message_ids(headers.get("references"))
+
+    return {
+        "message_id": message_ids[0] if message_ids else None,
+        "in_reply_to": in_reply_to[0] if in_reply_to else None,
+        "references": list(dict.fromkeys(in_reply_to + references[::-1]))
+    }
+
+def content_hash(sender_email: str, subject: str, body_text: str) -> str:
+    normalized = "\n".join(
+        _whitespace_re.sub(" ", value or "").strip().lower()
+        for value in (sender_email, subject, body_text)
+    )
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def dedupe_keys(canonical: Dict[str, Any]) -> List[str]:
+    if canonical.get("message_id"):
+        return [f"mid:{canonical['message_id']}"]
+
+    return [f"hash:{canonical['content_hash']}"]
+
+def is_duplicate(tenant_id: str, canonical: Dict[str, Any]) -> bool:
+    return any(_seen_messages.get((tenant_id, key)) for key in dedupe_keys(canonical))
+
+def remember_message(tenant_id: str, canonical: Dict[str, Any]):
+    for key in dedupe_keys(canonical):
+        _seen_messages.set((tenant_id, key), True)
+
+def dedupe_cache_stats() -> Dict[str, Any]:
+    return _seen_messages.stats()
+
+async def attach_reply(tenant_id: str, canonical: Dict[str, Any]) -> Optional[str]:
+    if not canonical.get("references"):
+        return None
+
+    supabase = get_async_supabase_client()
+
+    response = await supabase.rpc("attach_feedback_reply", {
+        "p_tenant_id": tenant_id,
+        "p_references": canonical["references"],
+        "p_message": {
+            "message_id": canonical.get("message_id"),
+            "in_reply_to": canonical.get("in_reply_to"),
+            "sender_email": canonical["sender_email"],
+            "sender_name": canonical["sender_name"],
+            "subject": canonical["subject"],
+            "body_text": canonical["body_text"]
+        }
+    }).execute()
+
+    return response.data
@@ -0,0 +1,186 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from api.database import get_supabase_client
+from api.pagination import apply_keyset
+from api.metrics import observe_export
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_STORAGE_BUCKET = os.getenv("EXPORT_STORAGE_BUCKET")
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "1000"))
+EXPORT_PROGRESS_EVERY_ROWS = int(os.getenv("EXPORT_PROGRESS_EVERY_ROWS", "10000"))
+
+EXPORT_COLUMNS = [
+    ("id", "string"),
+    ("created_at", "string"),
+    ("subject", "string"),
+    ("body_text", "string"),
+    ("sender_email", "string"),
+    ("sender_name", "string"),
+    ("recipient_email", "string"),
+    ("sentiment", "string"),
+    ("sentiment_score", "float"),
+    ("urgency", "string"),
+    ("urgency_score", "float"),
+    ("intent", "string"),
+    ("priority", "int"),
+    ("status", "string"),
+    ("is_satisfied", "bool"),
+    ("satisfied_at", "string")
+]
+
+EXPORT_FORMATS = {"csv": "csv", "json": "ndjson", "ndjson": "ndjson", "parquet": "parquet"}
+
+def iter_feedback_pages(
+    tenant_id: str,
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = EXPORT_PAGE_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    supabase = get_supabase_client()
+    filters = filters or {}
+    columns = ", ".join(name for name, _ in EXPORT_COLUMNS)
+    cursor = None
+
+    while True:
+        query = supabase.table("feedback_items").select(columns).eq("tenant_id", tenant_id)
+
+        for field in ("sentiment", "urgency", "status"):
+            if filters.get(field):
+                query = query.eq(field, filters[field])
+        if filters.get("start_date"):
+            query = query.gte("created_at", filters["start_date"])
+        if filters.get("end_date"):
+            query = query.lte("created_at", filters["end_date"])
+
+        if cursor:
+            query = apply_keyset(query, *cursor)
+
+        rows = query.order("created_at").order("id").limit(page_size).execute().data or []
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+def _write_csv(pages: Iterable[List[Dict[str, Any]]], path: str, on_page: Callable[[int], None]):
+    fieldnames = [name for name, _ in EXPORT_COLUMNS]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for rows in pages:
+            writer.writerows({key: _csv_value(value) for key, value in row.items()} for row in rows)
+            on_page(len(rows))
+
+def _write_ndjson(pages: Iterable[List[Dict[str, Any]]], path: str, on_page: Callable[[int], None]):
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in pages:
+            f.writelines(json.dumps(row, default=str) + "\n" for row in rows)
+            on_page(len(rows))
+
+def _write_parquet(pages: Iterable[List[Dict[str, Any]]], path: str, on_page: Callable[[int], None]):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet exports require pyarrow to be installed")
+
+    types = {"string": pa.string(), "float": pa.float64(), "int": pa.int64(), "bool": pa.bool_()}
+    schema = pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in pages:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            on_page(len(rows))
+
+_writers = {"csv": _write_csv, "ndjson": _write_ndjson, "parquet": _write_parquet}
+
+def write_export(
+    pages: Iterable[List[Dict[str, Any]]],
+    export_format: str,
+    path: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+    progress_every: int = EXPORT_PROGRESS_EVERY_ROWS
+) -> int:
+    kind = EXPORT_FORMATS.get(export_format.lower())
+    if kind is None:
+        raise Exception(f"Unsupported export format: {export_format}")
+
+    state = {"rows": 0, "reported": 0}
+
+    def on_page(count: int):
+        state["rows"] += count
+        if on_progress and state["rows"] - state["reported"] >= progress_every:
+            state["reported"] = state["rows"]
+            on_progress(state["rows"])
+
+    _writers[kind](pages, path, on_page)
+
+    return state["rows"]
+
+def export_path(tenant_id: str, export_id: str, export_format: str) -> str:
+    extension = EXPORT_FORMATS.get(export_format.lower(), export_format.lower())
+    directory = os.path.join(EXPORT_DIR, tenant_id)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{export_id}.{extension}")
+
+def run_export(export_id: str, tenant_id: str, export_format: str, filters: Optional[Dict[str, Any]] = None):
+    supabase = get_supabase_client()
+    started = time.perf_counter()
+
+    def report_progress(row_count: int):
+        supabase.table("exports").update({
+            "status": "processing",
+            "row_count": row_count
+        }).eq("id", export_id).execute()
+
+    try:
+        report_progress(0)
+
+        path = export_path(tenant_id, export_id, export_format)
+        row_count = write_export(
+            iter_feedback_pages(tenant_id, filters),
+            export_format,
+            path,
+            on_progress=report_progress
+        )
+
+        file_url = path
+        if EXPORT_STORAGE_BUCKET:
+            object_path = f"{tenant_id}/{os.path.basename(path)}"
+            supabase.storage.from_(EXPORT_STORAGE_BUCKET).upload(object_path, path)
+            os.remove(path)
+            file_url = f"{EXPORT_STORAGE_BUCKET}/{object_path}"
+
+        supabase.table("exports").update({
+            "status": "completed",
+            "row_count": row_count,
+            "file_url": file_url,
+            "completed_at": datetime.utcnow().isoformat()
+        }).eq("id", export_id).execute()
+
+        observe_export(export_format, "completed", time.perf_counter() - started, row_count)
+        print(f"Export {export_id} completed: {row_count} rows")
+    except Exception as e:
+        observe_export(export_format, "failed", time.perf_counter() - started)
+        print(f"Export {export_id} failed: {str(e)}")
+        supabase.table("exports").update({
+            "status": "failed",
+            "error_message": str(e)
+        }).eq("id", export_id).execute()
+
+async def generate_export(export_id: str, tenant_id: str, export_format: str = "csv", filters: Optional[Dict[str, Any]] = None):
+    print(f"Generating export {export_id} for tenant {tenant_id}")
+    await asyncio.to_thread(run_export, export_id, tenant_id, export_format, filters)
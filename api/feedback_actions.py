@@ -0,0 +1,26 @@
+import os
+from typing import Any, Dict, List, Optional
+
+from api.database import get_async_supabase_client
+
+MAX_BULK_FEEDBACK_IDS = int(os.getenv("MAX_BULK_FEEDBACK_IDS", "1000"))
+
+async def mark_feedback_satisfied(
+    tenant_id: str,
+    user_id: str,
+    feedback_ids: List[str],
+    note: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    if not feedback_ids:
+        return []
+
+    supabase = get_async_supabase_client()
+
+    response = await supabase.rpc("mark_feedback_satisfied", {
+        "p_tenant_id": tenant_id,
+        "p_user_id": user_id,
+        "p_feedback_ids": list(dict.fromkeys(feedback_ids)),
+        "p_note": note
+    }).execute()
+
+    return response.data or []
@@ -0,0 +1,154 @@
+import asyncio
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from api.database import get_async_supabase_client
+from api.metrics import ingest_stage
+
+FEEDBACK_BATCH_MAX_ROWS = int(os.getenv("FEEDBACK_BATCH_MAX_ROWS", "100"))
+FEEDBACK_BATCH_MAX_WAIT_MS = int(os.getenv("FEEDBACK_BATCH_MAX_WAIT_MS", "50"))
+
+PendingWrite = Tuple[Dict[str, Any], Optional[Dict[str, Any]], asyncio.Future]
+
+class AlertInsertError(Exception):
+    def __init__(self, row: Dict[str, Any], error: Exception):
+        super().__init__(f"Feedback {row['id']} was stored but its alert was not: {str(error)}")
+        self.row = row
+
+async def insert_feedback_batch(feedback: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    supabase = get_async_supabase_client()
+
+    result = await supabase.table("feedback_items").insert(feedback).execute()
+
+    return result.data
+
+async def insert_alerts(alerts: List[Dict[str, Any]]):
+    supabase = get_async_supabase_client()
+
+    with ingest_stage("alert"):
+        await supabase.table("alerts").insert(alerts).execute()
+
+async def insert_missing_alert(tenant_id: str, canonical: Dict[str, Any], alert: Dict[str, Any]) -> Optional[str]:
+    supabase = get_async_supabase_client()
+
+    query = supabase.table("feedback_items").select("id").eq("tenant_id", tenant_id)
+    if canonical.get("message_id"):
+        query = query.eq("message_id", canonical["message_id"])
+    else:
+        query = query.eq("content_hash", canonical["content_hash"]).is_("message_id", None)
+
+    feedback = await query.limit(1).execute()
+    if not feedback.data:
+        return None
+
+    feedback_id = feedback.data[0]["id"]
+    existing = await supabase.table("alerts") \
+        .select("id") \
+        .eq("feedback_id", feedback_id) \
+        .eq("alert_type", alert["alert_type"]) \
+        .limit(1) \
+        .execute()
+
+    if existing.data:
+        return None
+
+    await insert_alerts([{**alert, "feedback_id": feedback_id}])
+    return feedback_id
+
+class FeedbackBatchWriter:
+    def __init__(self, max_rows: int = FEEDBACK_BATCH_MAX_ROWS, max_wait_ms: int = FEEDBACK_BATCH_MAX_WAIT_MS):
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self._pending: List[PendingWrite] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self._producers = 0
+
+    @contextmanager
+    def producer(self):
+        self._producers += 1
+        try:
+            yield
+        finally:
+            self._producers -= 1
+            self._schedule()
+
+    def _schedule(self):
+        if not self._pending:
+            return
+
+        if len(self._pending) >= self.max_rows or len(self._pending) >= self._producers > 0:
+            self._flush_pending()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush_pending)
+
+    async def write(self, feedback: Dict[str, Any], alert: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((feedback, alert, future))
+        self._schedule()
+
+        return await future
+
+    def _flush_pending(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[PendingWrite]):
+        try:
+            rows = await insert_feedback_batch([feedback for feedback, _, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                _, _, future = batch[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+
+            print(f"Batch insert of {len(batch)} feedback items failed, retrying individually: {str(e)}")
+            await asyncio.gather(*(self._flush([item]) for item in batch))
+            return
+
+        alerts = [
+            (future, row, {**alert, "feedback_id": row["id"]})
+            for (_, alert, future), row in zip(batch, rows)
+            if alert
+        ]
+        failed: Set[asyncio.Future] = set()
+
+        if alerts:
+            try:
+                await insert_alerts([alert for _, _, alert in alerts])
+            except Exception as e:
+                for future, row, _ in alerts:
+                    failed.add(future)
+                    if not future.done():
+                        future.set_exception(AlertInsertError(row, e))
+
+        for (_, _, future), row in zip(batch, rows):
+            if future not in failed and not future.done():
+                future.set_result(row)
+
+        for _, _, future in batch[len(rows):]:
+            if not future.done():
+                future.set_exception(Exception("Feedback insert returned no row"))
+
+    async def close(self):
+        self._flush_pending()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+_feedback_writer: Optional[FeedbackBatchWriter] = None
+
+def get_feedback_writer() -> FeedbackBatchWriter:
+    global _feedback_writer
+    if _feedback_writer is None:
+        _feedback_writer = FeedbackBatchWriter()
+
+    return _feedback_writer
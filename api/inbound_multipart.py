@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from fastapi import Request
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+
+WEBHOOK_MAX_BODY_BYTES = int(os.getenv("WEBHOOK_MAX_BODY_BYTES", str(30 * 1024 * 1024)))
+WEBHOOK_MAX_FIELD_BYTES = int(os.getenv("WEBHOOK_MAX_FIELD_BYTES", str(2 * 1024 * 1024)))
+WEBHOOK_MAX_FIELDS_BYTES = int(os.getenv("WEBHOOK_MAX_FIELDS_BYTES", str(4 * 1024 * 1024)))
+WEBHOOK_MAX_ATTACHMENTS = int(os.getenv("WEBHOOK_MAX_ATTACHMENTS", "20"))
+
+INBOUND_FIELDS = {"from", "to", "cc", "subject", "text", "html", "headers", "charsets", "envelope", "attachments"}
+
+class InboundPayloadError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+class InboundEmailParser:
+    def __init__(
+        self,
+        boundary: bytes,
+        max_field_bytes: int = WEBHOOK_MAX_FIELD_BYTES,
+        max_fields_bytes: int = WEBHOOK_MAX_FIELDS_BYTES,
+        max_attachments: int = WEBHOOK_MAX_ATTACHMENTS
+    ):
+        self.max_field_bytes = max_field_bytes
+        self.max_attachments = max_attachments
+        self.fields: Dict[str, bytearray] = {}
+        self.attachments: List[Dict[str, Any]] = []
+        self.truncated: List[str] = []
+        self._budget = max_fields_bytes
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: Dict[bytes, bytes] = {}
+        self._field: Optional[bytearray] = None
+        self._field_name: Optional[str] = None
+        self._attachment: Optional[Dict[str, Any]] = None
+        self._digest = None
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end
+        })
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._field = None
+        self._field_name = None
+        self._attachment = None
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+
+        if b"filename" in options:
+            if len(self.attachments) >= self.max_attachments:
+                if "attachments" not in self.truncated:
+                    self.truncated.append("attachments")
+                return
+
+            self._attachment = {
+                "field": name,
+                "filename": os.path.basename(options[b"filename"].decode("utf-8", "replace")),
+                "content_type": self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1"),
+                "size": 0
+            }
+            self._digest = hashlib.sha256()
+            self.attachments.append(self._attachment)
+        elif name in INBOUND_FIELDS and name not in self.fields:
+            self._field_name = name
+            self._field = self.fields[name] = bytearray()
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._field is not None:
+            room = min(self.max_field_bytes - len(self._field), self._budget)
+            if end - start > room:
+                if self._field_name not in self.truncated:
+                    self.truncated.append(self._field_name)
+                end = start + max(room, 0)
+            self._field += data[start:end]
+            self._budget -= end - start
+        elif self._attachment is not None:
+            self._attachment["size"] += end - start
+            self._digest.update(data[start:end])
+
+    def _on_part_end(self):
+        if self._attachment is not None:
+            self._attachment["sha256"] = self._digest.hexdigest()
+        self._field = None
+        self._attachment = None
+
+    def write(self, chunk: bytes):
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as e:
+            raise InboundPayloadError(400, f"Malformed multipart body: {str(e)}")
+
+    def finish(self):
+        try:
+            self._parser.finalize()
+        except MultipartParseError as e:
+            raise InboundPayloadError(400, f"Malformed multipart body: {str(e)}")
+
+    def result(self) -> Dict[str, Any]:
+        try:
+            charsets = json.loads(self.fields.get("charsets") or b"{}")
+        except (TypeError, ValueError):
+            charsets = {}
+
+        fields = {}
+        for name, value in self.fields.items():
+            try:
+                fields[name] = value.decode(charsets.get(name) or "utf-8", "replace")
+            except LookupError:
+                fields[name] = value.decode("utf-8", "replace")
+
+        return {"fields": fields, "attachments": self.attachments, "truncated": self.truncated}
+
+async def parse_inbound_email(request: Request) -> Dict[str, Any]:
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > WEBHOOK_MAX_BODY_BYTES:
+        raise InboundPayloadError(413, f"Payload exceeds {WEBHOOK_MAX_BODY_BYTES} bytes")
+
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+
+    if content_type != b"multipart/form-data":
+        form = await request.form()
+        return {
+            "fields": {name: value for name, value in form.items() if name in INBOUND_FIELDS and isinstance(value, str)},
+            "attachments": [],
+            "truncated": []
+        }
+
+    if not options.get(b"boundary"):
+        raise InboundPayloadError(400, "Missing multipart boundary")
+
+    parser = InboundEmailParser(options[b"boundary"])
+    received = 0
+
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > WEBHOOK_MAX_BODY_BYTES:
+            raise InboundPayloadError(413, f"Payload exceeds {WEBHOOK_MAX_BODY_BYTES} bytes")
+        parser.write(chunk)
+
+    parser.finish()
+
+    return parser.result()
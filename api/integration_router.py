@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+from email.utils import getaddresses
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.database import get_async_supabase_client
+
+INTEGRATION_ROUTES_TTL_SECONDS = float(os.getenv("INTEGRATION_ROUTES_TTL_SECONDS", "60"))
+INTEGRATION_ROUTES_MISS_REFRESH_SECONDS = float(os.getenv("INTEGRATION_ROUTES_MISS_REFRESH_SECONDS", "5"))
+INTEGRATION_ROUTES_GENERATION_CHECK_SECONDS = float(os.getenv("INTEGRATION_ROUTES_GENERATION_CHECK_SECONDS", "1"))
+INTEGRATION_ROUTES_REDIS_URL = os.getenv("INTEGRATION_ROUTES_REDIS_URL") or os.getenv("REDIS_URL")
+
+def recipient_keys(recipient: str) -> List[str]:
+    keys = []
+    for _, address in getaddresses([recipient or ""]):
+        address = address.strip().lower()
+        if "@" not in address:
+            continue
+        keys.append(address)
+        keys.append(address.rsplit("@", 1)[1])
+
+    return keys
+
+def build_routes(integrations: List[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    defaults: Dict[str, List[Dict[str, Any]]] = {}
+
+    for integration in integrations:
+        settings = integration.get("settings") or {}
+        route = {"id": integration["id"], "tenant_id": integration["tenant_id"]}
+
+        keys = [
+            value.strip().lower()
+            for value in (settings.get("inbound_address"), settings.get("inbound_domain"))
+            if value
+        ]
+
+        if not keys:
+            defaults.setdefault(integration["provider"], []).append(route)
+
+        for key in keys:
+            routes[(integration["provider"], key)] = route
+
+    return routes, defaults
+
+class IntegrationRouter:
+    def __init__(
+        self,
+        ttl: float = INTEGRATION_ROUTES_TTL_SECONDS,
+        miss_refresh_interval: float = INTEGRATION_ROUTES_MISS_REFRESH_SECONDS,
+        generation_check_interval: float = INTEGRATION_ROUTES_GENERATION_CHECK_SECONDS,
+        redis_url: Optional[str] = INTEGRATION_ROUTES_REDIS_URL,
+        generation_key: str = "awakenu:integration_routes:generation"
+    ):
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.generation_check_interval = generation_check_interval
+        self.generation_key = generation_key
+        self._routes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._defaults: Dict[str, List[Dict[str, Any]]] = {}
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._generation_checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._redis = None
+
+        if redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url)
+
+    async def invalidate(self):
+        self._loaded_at = 0.0
+
+        if self._redis is not None:
+            try:
+                await self._redis.incr(self.generation_key)
+            except Exception as e:
+                print(f"Integration route invalidation failed: {str(e)}")
+
+    async def _shared_generation(self) -> Optional[int]:
+        if self._redis is None or time.monotonic() - self._generation_checked_at < self.generation_check_interval:
+            return None
+
+        self._generation_checked_at = time.monotonic()
+        try:
+            return int(await self._redis.get(self.generation_key) or 0)
+        except Exception as e:
+            print(f"Integration route generation read failed: {str(e)}")
+            return None
+
+    async def refresh(self, generation: Optional[int] = None):
+        async with self._lock:
+            if time.monotonic() - self._loaded_at < self.miss_refresh_interval:
+                return
+
+            integrations = await self._fetch_integrations()
+            self._routes, self._defaults = build_routes(integrations)
+            self._loaded_at = time.monotonic()
+            if generation is not None:
+                self._generation = generation
+
+    async def _fetch_integrations(self) -> List[Dict[str, Any]]:
+        supabase = get_async_supabase_client()
+
+        response = await supabase.table("email_integrations")\
+            .select("id, tenant_id, provider, settings")\
+            .eq("is_active", True)\
+            .execute()
+
+        return response.data or []
+
+    def _lookup(self, provider: str, recipient: str) -> Optional[Dict[str, Any]]:
+        for key in recipient_keys(recipient):
+            route = self._routes.get((provider, key))
+            if route:
+                return route
+
+        defaults = self._defaults.get(provider, [])
+        if len(defaults) == 1:
+            return defaults[0]
+
+        return None
+
+    async def resolve(self, provider: str, recipient: str) -> Optional[Dict[str, Any]]:
+        generation = await self._shared_generation()
+        if generation is not None and generation != self._generation:
+            self._loaded_at = 0.0
+
+        if time.monotonic() - self._loaded_at > self.ttl:
+            await self.refresh(generation)
+
+        route = self._lookup(provider, recipient)
+        if route is None and time.monotonic() - self._loaded_at > self.miss_refresh_interval:
+            await self.refresh()
+            route = self._lookup(provider, recipient)
+
+        return route
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+_integration_router: Optional[IntegrationRouter] = None
+
+def get_integration_router() -> IntegrationRouter:
+    global _integration_router
+    if _integration_router is None:
+        _integration_router = IntegrationRouter()
+
+    return _integration_router
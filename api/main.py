@@ -1,26 +1,60 @@
 from fastapi import FastAPI, HTTPException, Depends, Header, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
 import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import json
+import time
 from uuid import UUID
 
 from api.sentiment_engine import (
-    classify_sentiment,
-    detect_urgency,
-    classify_intent,
-    calculate_priority
+    classify_batch,
+    BATCH_WORKERS,
+    BATCH_CHUNK_SIZE,
+    LEXICON_CATEGORIES
 )
+from api.sentiment_model import get_sentiment_model, get_tenant_model, overlay_model_sentiment
 from api.email_processor import process_inbound_email, normalize_email
+from api.inbound_multipart import parse_inbound_email, InboundPayloadError
+from api.analytics import get_feedback_summary, get_feedback_trends
+from api.feedback_actions import mark_feedback_satisfied, MAX_BULK_FEEDBACK_IDS
+from api.exports import generate_export, EXPORT_FORMATS
+from api.pagination import apply_keyset, decode_cursor, encode_cursor
+from api.search import search_feedback
+from api.feedback_writer import get_feedback_writer
+from api.integration_router import get_integration_router
+from api.email_threads import dedupe_cache_stats
+from api.classification_cache import get_classification_cache
+from api.tenant_lexicons import get_tenant_lexicons
+from api.realtime import create_socket_app, publish, publish_feedback_updated
+from api.response_cache import get_response_cache
+from api.metrics import (
+    MetricsMiddleware,
+    METRICS_ENABLED,
+    CONTENT_TYPE_LATEST,
+    EMAIL_QUEUE_DEPTH,
+    register_stats,
+    render_metrics
+)
+from api.email_queue import (
+    get_email_queue,
+    new_job,
+    EmailWorkerPool,
+    QueueFullError,
+    EMAIL_QUEUE_BACKEND
+)
 from api.database import (
-    get_supabase_client,
+    get_async_supabase_client,
+    close_async_supabase_client,
     get_current_user,
     get_user_tenant,
     verify_tenant_access,
-    log_audit_event
+    log_audit_event,
+    auth_cache_stats,
+    get_audit_log_buffer
 )
 
 load_dotenv()
@@ -39,6 +73,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+register_stats("auth_token_cache", lambda: auth_cache_stats()["tokens"])
+register_stats("auth_tenant_cache", lambda: auth_cache_stats()["tenants"])
+register_stats("email_dedupe_cache", dedupe_cache_stats)
+register_stats("classification_cache", lambda: get_classification_cache().stats())
+register_stats("response_cache", lambda: get_response_cache().stats())
+register_stats("audit_log", lambda: get_audit_log_buffer().stats())
+
 class FeedbackFilter(BaseModel):
     sentiment: Optional[str] = None
     urgency: Optional[str] = None
@@ -52,6 +96,12 @@ class MarkSatisfiedRequest(BaseModel):
     template_id: Optional[str] = None
     note: Optional[str] = None
 
+class BulkMarkSatisfiedRequest(BaseModel):
+    feedback_ids: List[UUID]
+    auto_reply: bool = False
+    template_id: Optional[str] = None
+    note: Optional[str] = None
+
 class CreateCommentRequest(BaseModel):
     comment: str
     is_internal: bool = True
@@ -61,10 +111,54 @@ class EmailIntegrationRequest(BaseModel):
     provider: str
     settings: Dict[str, Any]
 
+class LexiconEntryRequest(BaseModel):
+    phrase: str
+    category: str
+    action: str = "add"
+
 class CreateExportRequest(BaseModel):
     format: str
     filters: Optional[Dict[str, Any]] = None
 
+class BatchAnalyzeRequest(BaseModel):
+    texts: List[str]
+
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10000"))
+MAX_FEEDBACK_PAGE_SIZE = 200
+
+FEEDBACK_LIST_FIELDS = [
+    "id", "created_at", "subject", "sender_email", "sender_name",
+    "sentiment", "sentiment_score", "urgency", "urgency_score",
+    "intent", "priority", "status", "is_satisfied"
+]
+
+FEEDBACK_FIELDS = set(FEEDBACK_LIST_FIELDS) | {
+    "tenant_id", "integration_id", "external_id", "source", "channel",
+    "body_text", "body_html", "recipient_email", "to_addresses", "cc_addresses",
+    "satisfied_at", "satisfied_by", "tags", "attachments", "metadata",
+    "processed_at", "updated_at"
+}
+
+@app.on_event("startup")
+async def start_email_workers():
+    get_sentiment_model()
+    app.state.email_workers = None
+    if EMAIL_QUEUE_BACKEND == "memory":
+        app.state.email_workers = EmailWorkerPool(get_email_queue(), process_inbound_email)
+        app.state.email_workers.start()
+
+@app.on_event("shutdown")
+async def stop_email_workers():
+    if app.state.email_workers:
+        await app.state.email_workers.stop()
+    await get_feedback_writer().close()
+    await get_email_queue().close()
+    await get_audit_log_buffer().close()
+    await get_classification_cache().close()
+    await get_response_cache().close()
+    await get_integration_router().close()
+    await close_async_supabase_client()
+
 @app.get("/")
 def read_root():
     return {
@@ -75,28 +169,93 @@ def read_root():
 
 @app.get("/api/health")
 def health_check():
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "auth_cache": auth_cache_stats(),
+        "audit_log": get_audit_log_buffer().stats(),
+        "email_dedupe": dedupe_cache_stats(),
+        "classification_cache": get_classification_cache().stats(),
+        "response_cache": get_response_cache().stats()
+    }
+
+@app.get("/metrics")
+async def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+
+    try:
+        EMAIL_QUEUE_DEPTH.set(await get_email_queue().depth())
+    except Exception as e:
+        print(f"Failed to read email queue depth: {str(e)}")
+
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 @app.post("/webhook/sendgrid")
-async def sendgrid_webhook(request: Request, background_tasks: BackgroundTasks):
+async def sendgrid_webhook(request: Request):
     try:
-        form_data = await request.form()
+        payload = await parse_inbound_email(request)
+        fields = payload["fields"]
         email_data = {
-            "from": form_data.get("from"),
-            "to": form_data.get("to"),
-            "subject": form_data.get("subject"),
-            "text": form_data.get("text"),
-            "html": form_data.get("html"),
-            "headers": form_data.get("headers"),
-            "attachments": form_data.get("attachments", 0)
+            "from": fields.get("from"),
+            "to": fields.get("to"),
+            "subject": fields.get("subject"),
+            "text": fields.get("text"),
+            "html": fields.get("html"),
+            "headers": fields.get("headers"),
+            "attachments": len(payload["attachments"]) or fields.get("attachments", 0),
+            "attachment_info": payload["attachments"],
+            "truncated_fields": payload["truncated"]
         }
 
-        background_tasks.add_task(process_inbound_email, email_data, "sendgrid")
+        await get_email_queue().enqueue(new_job(email_data, "sendgrid"))
 
         return {"status": "accepted", "message": "Email queued for processing"}
+    except InboundPayloadError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/analyze/batch")
+async def analyze_batch(
+    request: BatchAnalyzeRequest,
+    user_id: str = Depends(get_current_user)
+):
+    tenant_id = await get_user_tenant(user_id)
+
+    if len(request.texts) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} texts")
+
+    matcher = await get_tenant_lexicons().matcher(tenant_id)
+    model = await get_tenant_model(tenant_id)
+
+    def stream():
+        started = time.perf_counter()
+        count = 0
+
+        results = classify_batch(request.texts, matcher=matcher)
+        if model:
+            results = overlay_model_sentiment(results, request.texts, model, BATCH_CHUNK_SIZE)
+
+        for index, result in enumerate(results):
+            count += 1
+            yield json.dumps({"index": index, **result}) + "\n"
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            "count": count,
+            "elapsed_seconds": round(elapsed, 3),
+            "emails_per_sec": round(count / elapsed, 1) if elapsed > 0 else 0,
+            "workers": BATCH_WORKERS,
+            "engine": f"model:{model.version}" if model else "heuristic"
+        }
+        print(f"Batch classified {count} texts for tenant {tenant_id} - {summary['emails_per_sec']} emails/sec")
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @app.get("/api/feedback")
 async def get_feedback(
     sentiment: Optional[str] = None,
@@ -104,12 +263,25 @@ async def get_feedback(
     status: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    query = supabase.table("feedback_items").select("*").eq("tenant_id", tenant_id)
+    limit = max(1, min(limit, MAX_FEEDBACK_PAGE_SIZE))
+
+    if fields == "*":
+        columns = "*"
+    else:
+        requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else FEEDBACK_LIST_FIELDS
+        unknown = set(requested) - FEEDBACK_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        columns = ", ".join(dict.fromkeys(["id", "created_at", *requested]))
+
+    query = supabase.table("feedback_items").select(columns).eq("tenant_id", tenant_id)
 
     if sentiment:
         query = query.eq("sentiment", sentiment)
@@ -118,73 +290,129 @@ async def get_feedback(
     if status:
         query = query.eq("status", status)
 
-    response = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
+    if cursor:
+        try:
+            query = apply_keyset(query, *decode_cursor(cursor), desc=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+    else:
+        query = query.order("created_at", desc=True).order("id", desc=True).range(offset, offset + limit)
+
+    rows = (await query.execute()).data
 
-    return {"data": response.data, "count": len(response.data)}
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    return {"data": rows, "count": len(rows), "next_cursor": next_cursor}
+
+@app.get("/api/feedback/search")
+async def search_feedback_items(
+    q: str,
+    sentiment: Optional[str] = None,
+    urgency: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    user_id: str = Depends(get_current_user)
+):
+    tenant_id = await get_user_tenant(user_id)
+
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Search query is required")
+
+    results = await search_feedback(tenant_id, q, limit, offset, {
+        "sentiment": sentiment,
+        "urgency": urgency,
+        "status": status
+    })
+
+    return {"data": results, "count": len(results), "query": q}
 
 @app.get("/api/feedback/{feedback_id}")
 async def get_feedback_detail(
     feedback_id: str,
+    request: Request,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    response = supabase.table("feedback_items")\
-        .select("*, feedback_comments(*)")\
-        .eq("id", feedback_id)\
-        .eq("tenant_id", tenant_id)\
-        .maybeSingle()\
-        .execute()
+    async def load():
+        response = await supabase.table("feedback_items")\
+            .select("*, feedback_comments(*)")\
+            .eq("id", feedback_id)\
+            .eq("tenant_id", tenant_id)\
+            .maybeSingle()\
+            .execute()
 
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Feedback not found")
+        if not response.data:
+            raise HTTPException(status_code=404, detail="Feedback not found")
 
-    return response.data
+        return response.data
 
-@app.post("/api/feedback/{feedback_id}/satisfy")
-async def mark_satisfied(
-    feedback_id: str,
-    request: MarkSatisfiedRequest,
+    return await get_response_cache().respond(request, tenant_id, "feedback_detail", {"id": feedback_id}, load)
+
+@app.post("/api/feedback/satisfy")
+async def bulk_mark_satisfied(
+    request: BulkMarkSatisfiedRequest,
     background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    feedback = supabase.table("feedback_items")\
-        .select("*")\
-        .eq("id", feedback_id)\
-        .eq("tenant_id", tenant_id)\
-        .maybeSingle()\
-        .execute()
+    if not request.feedback_ids:
+        raise HTTPException(status_code=400, detail="No feedback IDs provided")
+    if len(request.feedback_ids) > MAX_BULK_FEEDBACK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_FEEDBACK_IDS} feedback IDs per request")
 
-    if not feedback.data:
-        raise HTTPException(status_code=404, detail="Feedback not found")
+    feedback_ids = list(dict.fromkeys(str(feedback_id) for feedback_id in request.feedback_ids))
+    updated = await mark_feedback_satisfied(tenant_id, user_id, feedback_ids, request.note)
+
+    if updated:
+        await get_response_cache().invalidate(tenant_id, "analytics", "feedback")
+        await publish(tenant_id, "feedback.bulk_updated", {
+            "ids": [row["id"] for row in updated],
+            "status": "closed",
+            "is_satisfied": True
+        })
 
-    update_data = {
-        "is_satisfied": True,
-        "satisfied_at": datetime.utcnow().isoformat(),
-        "satisfied_by": user_id,
-        "status": "closed"
+    if request.auto_reply and request.template_id:
+        for row in updated:
+            background_tasks.add_task(send_auto_reply, row["id"], request.template_id, tenant_id)
+
+    updated_ids = {str(row["id"]).lower() for row in updated}
+
+    return {
+        "success": True,
+        "updated": len(updated),
+        "not_found": [feedback_id for feedback_id in feedback_ids if feedback_id not in updated_ids],
+        "data": updated
     }
 
-    supabase.table("feedback_items").update(update_data).eq("id", feedback_id).execute()
+@app.post("/api/feedback/{feedback_id}/satisfy")
+async def mark_satisfied(
+    feedback_id: UUID,
+    request: MarkSatisfiedRequest,
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user)
+):
+    tenant_id = await get_user_tenant(user_id)
 
-    if request.note:
-        supabase.table("feedback_comments").insert({
-            "feedback_id": feedback_id,
-            "user_id": user_id,
-            "comment": request.note,
-            "is_internal": True
-        }).execute()
+    updated = await mark_feedback_satisfied(tenant_id, user_id, [str(feedback_id)], request.note)
+
+    if not updated:
+        raise HTTPException(status_code=404, detail="Feedback not found")
 
-    await log_audit_event(tenant_id, user_id, "feedback.satisfied", {"feedback_id": feedback_id})
+    await get_response_cache().invalidate(tenant_id, "analytics", "feedback")
+    await publish_feedback_updated(tenant_id, updated[0])
 
     if request.auto_reply and request.template_id:
-        background_tasks.add_task(send_auto_reply, feedback_id, request.template_id, tenant_id)
+        background_tasks.add_task(send_auto_reply, str(feedback_id), request.template_id, tenant_id)
 
-    return {"success": True, "message": "Feedback marked as satisfied"}
+    return {"success": True, "message": "Feedback marked as satisfied", "data": updated[0]}
 
 @app.post("/api/feedback/{feedback_id}/comment")
 async def add_comment(
@@ -192,10 +420,10 @@ async def add_comment(
     request: CreateCommentRequest,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    feedback = supabase.table("feedback_items")\
+    feedback = await supabase.table("feedback_items")\
         .select("id")\
         .eq("id", feedback_id)\
         .eq("tenant_id", tenant_id)\
@@ -212,101 +440,62 @@ async def add_comment(
         "is_internal": request.is_internal
     }
 
-    response = supabase.table("feedback_comments").insert(comment_data).execute()
+    response = await supabase.table("feedback_comments").insert(comment_data).execute()
+    await get_response_cache().invalidate(tenant_id, "feedback")
 
-    await log_audit_event(tenant_id, user_id, "feedback.comment", {"feedback_id": feedback_id})
+    log_audit_event(tenant_id, user_id, "feedback.comment", {"feedback_id": feedback_id})
 
     return response.data[0]
 
 @app.get("/api/analytics/summary")
 async def get_analytics_summary(
+    request: Request,
     days: int = 30,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-
-    feedback = supabase.table("feedback_items")\
-        .select("sentiment, urgency, status, is_satisfied, created_at")\
-        .eq("tenant_id", tenant_id)\
-        .gte("created_at", start_date)\
-        .execute()
-
-    data = feedback.data
+    async def load():
+        start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        return await get_feedback_summary(tenant_id, start_date)
 
-    total = len(data)
-    positive = len([f for f in data if f.get("sentiment") == "positive"])
-    negative = len([f for f in data if f.get("sentiment") == "negative"])
-    neutral = len([f for f in data if f.get("sentiment") == "neutral"])
-
-    high_urgency = len([f for f in data if f.get("urgency") == "high"])
-    satisfied = len([f for f in data if f.get("is_satisfied")])
-
-    return {
-        "total_feedback": total,
-        "sentiment_distribution": {
-            "positive": positive,
-            "negative": negative,
-            "neutral": neutral
-        },
-        "urgency_distribution": {
-            "high": high_urgency,
-            "medium": len([f for f in data if f.get("urgency") == "medium"]),
-            "low": len([f for f in data if f.get("urgency") == "low"])
-        },
-        "satisfaction_rate": (satisfied / total * 100) if total > 0 else 0,
-        "open_items": len([f for f in data if f.get("status") == "open"])
-    }
+    return await get_response_cache().respond(request, tenant_id, "analytics_summary", {"days": days}, load)
 
 @app.get("/api/analytics/trends")
 async def get_analytics_trends(
+    request: Request,
     days: int = 30,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-
-    feedback = supabase.table("feedback_items")\
-        .select("created_at, sentiment")\
-        .eq("tenant_id", tenant_id)\
-        .gte("created_at", start_date)\
-        .order("created_at")\
-        .execute()
-
-    daily_data = {}
-    for item in feedback.data:
-        date = item["created_at"][:10]
-        if date not in daily_data:
-            daily_data[date] = {"positive": 0, "negative": 0, "neutral": 0, "total": 0}
+    async def load():
+        start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        return {"trends": await get_feedback_trends(tenant_id, start_date)}
 
-        sentiment = item.get("sentiment", "neutral")
-        daily_data[date][sentiment] += 1
-        daily_data[date]["total"] += 1
-
-    return {"trends": daily_data}
+    return await get_response_cache().respond(request, tenant_id, "analytics_trends", {"days": days}, load)
 
 @app.get("/api/integrations")
-async def get_integrations(user_id: str = Depends(get_current_user)):
-    supabase = get_supabase_client()
+async def get_integrations(request: Request, user_id: str = Depends(get_current_user)):
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    response = supabase.table("email_integrations")\
-        .select("id, name, provider, is_active, last_sync, created_at")\
-        .eq("tenant_id", tenant_id)\
-        .execute()
+    async def load():
+        response = await supabase.table("email_integrations")\
+            .select("id, name, provider, is_active, last_sync, created_at")\
+            .eq("tenant_id", tenant_id)\
+            .execute()
+
+        return {"integrations": response.data}
 
-    return {"integrations": response.data}
+    return await get_response_cache().respond(request, tenant_id, "integrations", {}, load)
 
 @app.post("/api/integrations")
 async def create_integration(
     request: EmailIntegrationRequest,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
     integration_data = {
@@ -317,24 +506,99 @@ async def create_integration(
         "is_active": True
     }
 
-    response = supabase.table("email_integrations").insert(integration_data).execute()
+    response = await supabase.table("email_integrations").insert(integration_data).execute()
+    await get_integration_router().invalidate()
+    await get_response_cache().invalidate(tenant_id, "integrations")
 
-    await log_audit_event(tenant_id, user_id, "integration.created", {
+    log_audit_event(tenant_id, user_id, "integration.created", {
         "integration_id": response.data[0]["id"],
         "provider": request.provider
     })
 
     return response.data[0]
 
+@app.get("/api/lexicon")
+async def get_lexicon(user_id: str = Depends(get_current_user)):
+    supabase = get_async_supabase_client()
+    tenant_id = await get_user_tenant(user_id)
+
+    response = await supabase.table("tenant_lexicon_entries")\
+        .select("id, phrase, category, action, created_at")\
+        .eq("tenant_id", tenant_id)\
+        .order("category")\
+        .order("phrase")\
+        .execute()
+
+    return {"entries": response.data, "categories": list(LEXICON_CATEGORIES)}
+
+@app.post("/api/lexicon")
+async def upsert_lexicon_entry(
+    request: LexiconEntryRequest,
+    user_id: str = Depends(get_current_user)
+):
+    supabase = get_async_supabase_client()
+    tenant_id = await get_user_tenant(user_id)
+
+    phrase = request.phrase.strip().lower()
+    if not phrase:
+        raise HTTPException(status_code=400, detail="Phrase is required")
+    if request.category not in LEXICON_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Unknown lexicon category: {request.category}")
+    if request.action not in ("add", "remove"):
+        raise HTTPException(status_code=400, detail="Action must be 'add' or 'remove'")
+
+    response = await supabase.table("tenant_lexicon_entries").upsert({
+        "tenant_id": tenant_id,
+        "phrase": phrase,
+        "category": request.category,
+        "action": request.action,
+        "created_by": user_id,
+        "updated_at": datetime.utcnow().isoformat()
+    }, on_conflict="tenant_id,phrase,category").execute()
+    get_tenant_lexicons().invalidate(tenant_id)
+
+    log_audit_event(tenant_id, user_id, "lexicon.updated", {
+        "phrase": phrase,
+        "category": request.category,
+        "action": request.action
+    })
+
+    return response.data[0]
+
+@app.delete("/api/lexicon/{entry_id}")
+async def delete_lexicon_entry(
+    entry_id: str,
+    user_id: str = Depends(get_current_user)
+):
+    supabase = get_async_supabase_client()
+    tenant_id = await get_user_tenant(user_id)
+
+    response = await supabase.table("tenant_lexicon_entries")\
+        .delete()\
+        .eq("id", entry_id)\
+        .eq("tenant_id", tenant_id)\
+        .execute()
+
+    if not response.data:
+        raise HTTPException(status_code=404, detail="Lexicon entry not found")
+
+    get_tenant_lexicons().invalidate(tenant_id)
+    log_audit_event(tenant_id, user_id, "lexicon.deleted", {"entry_id": entry_id})
+
+    return {"success": True}
+
 @app.post("/api/exports")
 async def create_export(
     request: CreateExportRequest,
     background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
+    if request.format.lower() not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {request.format}")
+
     export_data = {
         "tenant_id": tenant_id,
         "created_by": user_id,
@@ -343,10 +607,10 @@ async def create_export(
         "status": "pending"
     }
 
-    response = supabase.table("exports").insert(export_data).execute()
+    response = await supabase.table("exports").insert(export_data).execute()
     export_id = response.data[0]["id"]
 
-    background_tasks.add_task(generate_export, export_id, tenant_id)
+    background_tasks.add_task(generate_export, export_id, tenant_id, request.format, request.filters)
 
     return {"export_id": export_id, "status": "pending"}
 
@@ -355,10 +619,10 @@ async def get_export(
     export_id: str,
     user_id: str = Depends(get_current_user)
 ):
-    supabase = get_supabase_client()
+    supabase = get_async_supabase_client()
     tenant_id = await get_user_tenant(user_id)
 
-    response = supabase.table("exports")\
+    response = await supabase.table("exports")\
         .select("*")\
         .eq("id", export_id)\
         .eq("tenant_id", tenant_id)\
@@ -373,27 +637,8 @@ async def get_export(
 async def send_auto_reply(feedback_id: str, template_id: str, tenant_id: str):
     print(f"Sending auto-reply for feedback {feedback_id} using template {template_id}")
 
-async def generate_export(export_id: str, tenant_id: str):
-    print(f"Generating export {export_id} for tenant {tenant_id}")
-    supabase = get_supabase_client()
-
-    try:
-        feedback = supabase.table("feedback_items")\
-            .select("*")\
-            .eq("tenant_id", tenant_id)\
-            .execute()
-
-        supabase.table("exports").update({
-            "status": "completed",
-            "row_count": len(feedback.data),
-            "completed_at": datetime.utcnow().isoformat()
-        }).eq("id", export_id).execute()
-    except Exception as e:
-        supabase.table("exports").update({
-            "status": "failed",
-            "error_message": str(e)
-        }).eq("id", export_id).execute()
+socket_app = create_socket_app(app)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(socket_app, host="0.0.0.0", port=8000)
@@ -0,0 +1,193 @@
+import asyncio
+import os
+import random
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest, start_http_server
+from prometheus_client.core import GaugeMetricFamily
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_SLOW_REQUEST_SECONDS = float(os.getenv("METRICS_SLOW_REQUEST_SECONDS", "2"))
+METRICS_SLOW_TRACE_SAMPLE_RATE = float(os.getenv("METRICS_SLOW_TRACE_SAMPLE_RATE", "0"))
+METRICS_SLOW_TRACE_FRAMES = int(os.getenv("METRICS_SLOW_TRACE_FRAMES", "30"))
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+INGEST_STAGES = ("normalize", "route", "dedupe", "classify", "insert", "alert", "publish")
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "awakenu_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS
+)
+HTTP_SLOW_REQUESTS = Counter(
+    "awakenu_http_slow_requests_total",
+    "Requests slower than METRICS_SLOW_REQUEST_SECONDS",
+    ["method", "route"]
+)
+INGEST_STAGE_SECONDS = Histogram(
+    "awakenu_ingest_stage_duration_seconds",
+    "Time spent in each stage of inbound email processing",
+    ["stage"],
+    buckets=STAGE_BUCKETS
+)
+INGEST_EMAILS = Counter(
+    "awakenu_ingest_emails_total",
+    "Inbound emails by processing outcome",
+    ["outcome"]
+)
+EMAIL_JOBS = Counter(
+    "awakenu_email_jobs_total",
+    "Queued email jobs by worker outcome",
+    ["outcome"]
+)
+EMAIL_QUEUE_DEPTH = Gauge(
+    "awakenu_email_queue_depth",
+    "Jobs waiting in the inbound email queue"
+)
+SUPABASE_REQUEST_SECONDS = Histogram(
+    "awakenu_supabase_request_duration_seconds",
+    "PostgREST calls by table or RPC",
+    ["method", "target", "status"],
+    buckets=STAGE_BUCKETS + (5.0, 10.0)
+)
+EXPORT_SECONDS = Histogram(
+    "awakenu_export_duration_seconds",
+    "Export generation time",
+    ["format", "status"],
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+)
+EXPORT_ROWS = Counter(
+    "awakenu_export_rows_total",
+    "Rows written to exports",
+    ["format"]
+)
+
+_ingest_stages = {stage: INGEST_STAGE_SECONDS.labels(stage) for stage in INGEST_STAGES}
+
+def ingest_stage(stage: str):
+    return _ingest_stages[stage].time()
+
+def count_ingest(outcome: str):
+    INGEST_EMAILS.labels(outcome).inc()
+
+def count_email_job(outcome: str):
+    EMAIL_JOBS.labels(outcome).inc()
+
+def observe_supabase_request(method: str, target: str, status: str, seconds: float):
+    SUPABASE_REQUEST_SECONDS.labels(method, target, status).observe(seconds)
+
+def observe_export(export_format: str, status: str, seconds: float, rows: int = 0):
+    EXPORT_SECONDS.labels(export_format, status).observe(seconds)
+    if rows:
+        EXPORT_ROWS.labels(export_format).inc(rows)
+
+class StatsCollector:
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, component: str, stats: Callable[[], Dict[str, Any]]):
+        self._sources[component] = stats
+
+    def collect(self):
+        for component, stats in list(self._sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                print(f"Failed to collect {component} stats: {str(e)}")
+                continue
+
+            for key, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    yield GaugeMetricFamily(f"awakenu_{component}_{key}", f"{component} {key}", value=value)
+
+_stats_collector = StatsCollector()
+REGISTRY.register(_stats_collector)
+
+def register_stats(component: str, stats: Callable[[], Dict[str, Any]]):
+    _stats_collector.register(component, stats)
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
+
+def start_metrics_server(port: int):
+    start_http_server(port)
+    print(f"Serving metrics on :{port}/metrics")
+
+def _await_frames(coro: Any) -> List[Any]:
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return frames[-METRICS_SLOW_TRACE_FRAMES:]
+
+def _dump_stack(task: asyncio.Task, method: str, path: str):
+    if task.done():
+        return
+
+    stack = traceback.StackSummary.extract((frame, frame.f_lineno) for frame in _await_frames(task.get_coro()))
+    print(f"Slow request {method} {path} still running after {METRICS_SLOW_REQUEST_SECONDS}s:\n{''.join(stack.format())}")
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[Any, str] = {}
+
+    def _route_label(self, scope: Dict[str, Any]) -> str:
+        route = scope.get("route")
+        if route is not None and hasattr(route, "path"):
+            return route.path
+
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+
+        if endpoint not in self._routes:
+            for candidate in scope["app"].routes:
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    self._routes[endpoint] = candidate.path
+                    break
+            else:
+                self._routes[endpoint] = "unmatched"
+
+        return self._routes[endpoint]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        trace: Optional[asyncio.TimerHandle] = None
+        if METRICS_SLOW_TRACE_SAMPLE_RATE > 0 and random.random() < METRICS_SLOW_TRACE_SAMPLE_RATE:
+            trace = asyncio.get_running_loop().call_later(
+                METRICS_SLOW_REQUEST_SECONDS, _dump_stack, asyncio.current_task(), scope["method"], scope["path"]
+            )
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            if trace is not None:
+                trace.cancel()
+
+            elapsed = time.perf_counter() - started
+            route = self._route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status)).observe(elapsed)
+            if elapsed >= METRICS_SLOW_REQUEST_SECONDS:
+                HTTP_SLOW_REQUESTS.labels(scope["method"], route).inc()
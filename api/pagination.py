@@ -0,0 +1,24 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    payload = json.dumps([row["created_at"], row["id"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+        row_id = uuid.UUID(str(row_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    return created_at.isoformat(), str(row_id)
+
+def apply_keyset(query, created_at: str, row_id: str, desc: bool = False):
+    op = "lt" if desc else "gt"
+    return query.or_(f'created_at.{op}."{created_at}",and(created_at.eq."{created_at}",id.{op}.{row_id})')
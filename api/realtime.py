@@ -0,0 +1,76 @@
+import os
+from typing import Any, Dict, Optional
+
+import socketio
+from fastapi import HTTPException
+
+from api.database import get_current_user, get_user_tenant
+
+REALTIME_REDIS_URL = os.getenv("REALTIME_REDIS_URL")
+REALTIME_CHANNEL = os.getenv("REALTIME_CHANNEL", "awakenu:realtime")
+
+FEEDBACK_EVENT_FIELDS = (
+    "id", "created_at", "subject", "sender_email", "sender_name",
+    "sentiment", "urgency", "intent", "priority", "status", "is_satisfied"
+)
+
+_server: Optional[socketio.AsyncServer] = None
+_emitter: Optional[socketio.AsyncRedisManager] = None
+
+def tenant_room(tenant_id: str) -> str:
+    return f"tenant:{tenant_id}"
+
+def get_realtime_server() -> socketio.AsyncServer:
+    global _server
+    if _server is None:
+        manager = socketio.AsyncRedisManager(REALTIME_REDIS_URL, channel=REALTIME_CHANNEL) if REALTIME_REDIS_URL else None
+        _server = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*", client_manager=manager)
+
+        @_server.event
+        async def connect(sid, environ, auth):
+            token = (auth or {}).get("token")
+            if not token:
+                raise socketio.exceptions.ConnectionRefusedError("Authentication required")
+
+            try:
+                user_id = await get_current_user(f"Bearer {token}")
+                tenant_id = await get_user_tenant(user_id)
+            except HTTPException as e:
+                raise socketio.exceptions.ConnectionRefusedError(e.detail)
+
+            await _server.enter_room(sid, tenant_room(tenant_id))
+
+    return _server
+
+def create_socket_app(app) -> socketio.ASGIApp:
+    return socketio.ASGIApp(get_realtime_server(), other_asgi_app=app)
+
+async def publish(tenant_id: str, event: str, payload: Dict[str, Any]):
+    global _emitter
+
+    try:
+        if _server is not None:
+            await _server.emit(event, payload, room=tenant_room(tenant_id))
+        elif REALTIME_REDIS_URL:
+            if _emitter is None:
+                _emitter = socketio.AsyncRedisManager(REALTIME_REDIS_URL, channel=REALTIME_CHANNEL, write_only=True)
+            await _emitter.emit(event, payload, namespace="/", room=tenant_room(tenant_id))
+    except Exception as e:
+        print(f"Failed to publish {event} for tenant {tenant_id}: {str(e)}")
+
+def feedback_event(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: row.get(field) for field in FEEDBACK_EVENT_FIELDS}
+
+async def publish_feedback_created(tenant_id: str, row: Dict[str, Any]):
+    await publish(tenant_id, "feedback.created", feedback_event(row))
+
+async def publish_feedback_updated(tenant_id: str, row: Dict[str, Any]):
+    await publish(tenant_id, "feedback.updated", feedback_event(row))
+
+async def publish_alert_created(tenant_id: str, feedback_id: str, alert: Dict[str, Any]):
+    await publish(tenant_id, "alert.created", {
+        "feedback_id": feedback_id,
+        "alert_type": alert.get("alert_type"),
+        "severity": alert.get("severity"),
+        "message": alert.get("message")
+    })
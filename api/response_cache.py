@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+from api.cache import LRUCache
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "5000"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_REDIS_URL = os.getenv("RESPONSE_CACHE_REDIS_URL")
+
+CACHE_SCOPES = {
+    "analytics_summary": "analytics",
+    "analytics_trends": "analytics",
+    "feedback_detail": "feedback",
+    "integrations": "integrations"
+}
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+class ResponseCache:
+    def __init__(
+        self,
+        maxsize: int = RESPONSE_CACHE_SIZE,
+        ttl: int = RESPONSE_CACHE_TTL_SECONDS,
+        redis_url: Optional[str] = RESPONSE_CACHE_REDIS_URL,
+        prefix: str = "awakenu:responses"
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._local = LRUCache(maxsize, ttl)
+        self._generations: Dict[Tuple[str, str], int] = {}
+        self._loading: Dict[Tuple[str, int, str, str], asyncio.Future] = {}
+        self.redis_hits = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self._redis = None
+
+        if redis_url:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(redis_url)
+
+    async def generation(self, tenant_id: str, scope: str) -> int:
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(f"{self.prefix}:generation:{tenant_id}:{scope}")
+                return int(value or 0)
+            except Exception as e:
+                print(f"Response cache generation read failed: {str(e)}")
+
+        return self._generations.get((tenant_id, scope), 0)
+
+    async def invalidate(self, tenant_id: str, *scopes: str):
+        scopes = scopes or tuple(set(CACHE_SCOPES.values()))
+        self.invalidations += 1
+        for scope in scopes:
+            self._generations[(tenant_id, scope)] = self._generations.get((tenant_id, scope), 0) + 1
+
+        if self._redis is not None:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for scope in scopes:
+                        pipe.incr(f"{self.prefix}:generation:{tenant_id}:{scope}")
+                    await pipe.execute()
+            except Exception as e:
+                print(f"Response cache invalidation failed: {str(e)}")
+
+    async def get_or_load(
+        self,
+        tenant_id: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Tuple[str, bytes]:
+        generation = await self.generation(tenant_id, CACHE_SCOPES.get(endpoint, endpoint))
+        key = (tenant_id, generation, endpoint, _params_key(params))
+
+        cached = self._local.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+
+        try:
+            cached = await self._load(key, loader)
+            future.set_result(cached)
+            return cached
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._loading[key]
+            if not future.done():
+                future.cancel()
+
+    async def _load(self, key: Tuple[str, int, str, str], loader: Callable[[], Awaitable[Any]]) -> Tuple[str, bytes]:
+        tenant_id, generation, endpoint, params = key
+        redis_key = f"{self.prefix}:{tenant_id}:{generation}:{endpoint}:{hashlib.sha256(params.encode('utf-8')).hexdigest()}"
+
+        if self._redis is not None:
+            try:
+                body = await self._redis.get(redis_key)
+            except Exception as e:
+                print(f"Response cache read failed: {str(e)}")
+                body = None
+
+            if body is not None:
+                cached = (_etag(body), body)
+                self._local.set(key, cached)
+                self.redis_hits += 1
+                return cached
+
+        body = json.dumps(await loader(), default=str).encode("utf-8")
+        cached = (_etag(body), body)
+        self._local.set(key, cached)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(redis_key, body, ex=self.ttl)
+            except Exception as e:
+                print(f"Response cache write failed: {str(e)}")
+
+        return cached
+
+    async def respond(
+        self,
+        request: Request,
+        tenant_id: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        etag, body = await self.get_or_load(tenant_id, endpoint, params, loader)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in if_none_match or if_none_match.strip() == "*":
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._local.stats(),
+            "redis_hits": self.redis_hits,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations
+        }
+
+    async def close(self):
+        if self._redis is not None:
+            await self._redis.aclose()
+
+_response_cache: Optional[ResponseCache] = None
+
+def get_response_cache() -> ResponseCache:
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+
+    return _response_cache
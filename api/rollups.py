@@ -0,0 +1,36 @@
+import argparse
+import os
+from typing import Optional
+
+from supabase import Client, create_client
+
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+
+def get_service_client() -> Client:
+    supabase_url = os.getenv("VITE_SUPABASE_URL")
+    if not supabase_url or not SUPABASE_SERVICE_ROLE_KEY:
+        raise Exception("VITE_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required to rebuild rollups")
+
+    return create_client(supabase_url, SUPABASE_SERVICE_ROLE_KEY)
+
+def backfill_rollups(tenant_id: Optional[str] = None, since: Optional[str] = None) -> int:
+    supabase = get_service_client()
+
+    response = supabase.rpc("rebuild_feedback_daily_rollups", {
+        "p_tenant_id": tenant_id,
+        "p_start_day": since
+    }).execute()
+
+    return response.data or 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild feedback_daily_rollups from feedback_items")
+    parser.add_argument("--tenant", help="Only rebuild this tenant (default: all tenants)")
+    parser.add_argument("--since", help="Only rebuild days on or after YYYY-MM-DD (default: all days)")
+    args = parser.parse_args()
+
+    rows = backfill_rollups(args.tenant, args.since)
+    print(f"Rebuilt {rows} rollup rows")
+
+if __name__ == "__main__":
+    main()
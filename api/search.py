@@ -0,0 +1,27 @@
+from typing import Any, Dict, List, Optional
+
+from api.database import get_async_supabase_client
+
+MAX_SEARCH_RESULTS = 100
+
+async def search_feedback(
+    tenant_id: str,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    filters: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    supabase = get_async_supabase_client()
+    filters = filters or {}
+
+    response = await supabase.rpc("search_feedback", {
+        "p_tenant_id": tenant_id,
+        "p_query": query,
+        "p_limit": max(1, min(limit, MAX_SEARCH_RESULTS)),
+        "p_offset": max(0, offset),
+        "p_sentiment": filters.get("sentiment"),
+        "p_urgency": filters.get("urgency"),
+        "p_status": filters.get("status")
+    }).execute()
+
+    return response.data or []
@@ -1,5 +1,10 @@
+import hashlib
+import os
 import re
-from typing import Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 positive_words = {
     'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'awesome',
@@ -25,55 +30,260 @@ urgency_keywords = {
 intensifiers = {'very', 'extremely', 'really', 'absolutely', 'totally', 'incredibly', 'highly'}
 negations = {'not', 'no', "n't", 'never', 'neither', 'nobody', 'nothing', 'nowhere'}
 
+complaint_keywords = {'complaint', 'issue', 'problem', 'broken', 'not working', 'error', 'bug'}
+praise_keywords = {'thank', 'thanks', 'great', 'excellent', 'love', 'appreciate'}
+question_keywords = {'how', 'what', 'when', 'where', 'why', 'can', 'could', 'would', '?'}
+request_keywords = {'please', 'need', 'want', 'request', 'can you', 'could you'}
+
+POSITIVE = 1
+NEGATIVE = 2
+URGENT = 4
+INTENSIFIER = 8
+NEGATION = 16
+COMPLAINT = 32
+PRAISE = 64
+QUESTION = 128
+REQUEST = 256
+
+_non_word_re = re.compile(r'[^\w\s]')
+
+LEXICON_CATEGORIES = {
+    "positive": POSITIVE,
+    "negative": NEGATIVE,
+    "urgency": URGENT,
+    "intensifier": INTENSIFIER,
+    "negation": NEGATION,
+    "complaint": COMPLAINT,
+    "praise": PRAISE,
+    "question": QUESTION,
+    "request": REQUEST
+}
+
+def compile_lexicon(entries: Optional[Iterable[Dict]] = None) -> Dict[str, int]:
+    table: Dict[str, int] = {}
+    for words, flag in (
+        (positive_words, POSITIVE),
+        (negative_words, NEGATIVE),
+        (urgency_keywords, URGENT),
+        (intensifiers, INTENSIFIER),
+        (negations, NEGATION),
+        (complaint_keywords, COMPLAINT),
+        (praise_keywords, PRAISE),
+        (question_keywords, QUESTION),
+        (request_keywords, REQUEST),
+    ):
+        for word in words:
+            if "'" in word:
+                continue
+            table[word] = table.get(word, 0) | flag
+
+    for entry in entries or ():
+        phrase = entry["phrase"].strip().lower()
+        flag = LEXICON_CATEGORIES[entry["category"]]
+        if entry.get("action", "add") == "remove":
+            table[phrase] = table.get(phrase, 0) & ~flag
+        else:
+            table[phrase] = table.get(phrase, 0) | flag
+
+    return {phrase: flags for phrase, flags in table.items() if flags}
+
 def preprocess_text(text: str) -> list:
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-    words = text.split()
-    return words
+    return _non_word_re.sub(' ', text.lower()).split()
+
+COUNTED_FLAGS = (URGENT, COMPLAINT, PRAISE, QUESTION, REQUEST)
+
+SCORING_VERSION = "1"
+
+def lexicon_version(lexicon: Dict[str, int]) -> str:
+    digest = hashlib.sha256()
+    for phrase, flags in sorted(lexicon.items()):
+        digest.update(f"{phrase}\0{flags}\n".encode("utf-8"))
+    return f"{SCORING_VERSION}.{digest.hexdigest()[:16]}"
+
+class PhraseMatcher:
+    def __init__(self, lexicon: Dict[str, int]):
+        goto: List[Dict[str, int]] = [{}]
+        terminal: List[int] = [0]
+
+        for phrase, flags in lexicon.items():
+            tokens = preprocess_text(phrase)
+            if not tokens:
+                continue
+
+            state = 0
+            for token in tokens:
+                next_state = goto[state].get(token)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][token] = next_state
+                    goto.append({})
+                    terminal.append(0)
+                state = next_state
+            terminal[state] |= flags
+
+        fail = [0] * len(goto)
+        outputs: List[Tuple[int, ...]] = [()] * len(goto)
+        queue = deque()
+
+        for state in goto[0].values():
+            outputs[state] = (terminal[state],) if terminal[state] else ()
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for token, child in goto[state].items():
+                fallback = fail[state]
+                while fallback and token not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(token, 0)
+                own = (terminal[child],) if terminal[child] else ()
+                outputs[child] = own + outputs[fail[child]]
+                queue.append(child)
+
+        self.vocabulary: Set[str] = {token for transitions in goto for token in transitions}
+        self.flags: List[int] = [0] * len(goto)
+        self.counts: List[Tuple[int, ...]] = [()] * len(goto)
+
+        for state, matched in enumerate(outputs):
+            for flags in matched:
+                self.flags[state] |= flags
+            if self.flags[state]:
+                self.counts[state] = tuple(
+                    sum(1 for flags in matched if flags & counted) for counted in COUNTED_FLAGS
+                )
+
+        self.version = lexicon_version(lexicon)
+        self._goto = goto
+        self._fail = fail
+
+    def states(self, words: List[str]) -> List[int]:
+        goto = self._goto
+        fail = self._fail
+        vocabulary = self.vocabulary
+        state = 0
+        states = []
+        append = states.append
+
+        for word in words:
+            if word not in vocabulary:
+                state = 0
+            else:
+                while True:
+                    next_state = goto[state].get(word)
+                    if next_state is not None:
+                        state = next_state
+                        break
+                    if state == 0:
+                        break
+                    state = fail[state]
+            append(state)
+
+        return states
+
+_lexicon = compile_lexicon()
+_matcher = PhraseMatcher(_lexicon)
+
+def get_default_matcher() -> PhraseMatcher:
+    return _matcher
 
 def classify_sentiment(text: str) -> Dict:
-    if not text or len(text.strip()) == 0:
-        return {
-            "score": 0.0,
-            "label": "neutral",
-            "confidence": 0.5,
-            "metadata": {"word_count": 0, "positive_words": 0, "negative_words": 0}
-        }
+    return analyze_text(text)["sentiment"]
+
+def detect_urgency(text: str, metadata: Dict = None) -> Dict:
+    return analyze_text(text)["urgency"]
+
+def classify_intent(text: str) -> Dict:
+    return analyze_text(text)["intent"]
 
+def calculate_priority(sentiment_score: float, urgency: str, sentiment: str) -> int:
+    priority = 50
+
+    if urgency == "high":
+        priority += 40
+    elif urgency == "medium":
+        priority += 20
+
+    if sentiment == "negative":
+        priority += 20
+    elif sentiment == "positive":
+        priority -= 10
+
+    return min(100, max(0, priority))
+
+def analyze_text(text: str, matcher: Optional[PhraseMatcher] = None) -> Dict:
+    matcher = matcher or _matcher
     words = preprocess_text(text)
+    word_count = len(words)
+    state_flags = matcher.flags
+    state_counts = matcher.counts
 
     positive_count = 0
     negative_count = 0
-    intensity_multiplier = 1.0
+    urgency_count = 0
+    complaint_score = 0
+    praise_score = 0
+    question_score = 0
+    request_score = 0
     negate = False
 
-    for i, word in enumerate(words):
-        if word in intensifiers:
-            intensity_multiplier = 1.5
+    for state in matcher.states(words):
+        flags = state_flags[state]
+        if not flags:
+            negate = False
             continue
 
-        if word in negations:
+        urgent, complaint, praise, question, request = state_counts[state]
+        urgency_count += urgent
+        complaint_score += complaint
+        praise_score += praise
+        question_score += question
+        request_score += request
+
+        if flags & INTENSIFIER:
+            continue
+
+        if flags & NEGATION:
             negate = True
             continue
 
-        if word in positive_words:
-            score = 1.0 * intensity_multiplier
+        if flags & POSITIVE:
             if negate:
-                score = -score
                 negative_count += 1
             else:
                 positive_count += 1
-        elif word in negative_words:
-            score = -1.0 * intensity_multiplier
+        elif flags & NEGATIVE:
             if negate:
-                score = -score
                 positive_count += 1
             else:
                 negative_count += 1
 
-        intensity_multiplier = 1.0
         negate = False
 
+    sentiment = _sentiment_result(text, word_count, positive_count, negative_count)
+    urgency = _urgency_result(text, word_count, urgency_count)
+    intent = _intent_result(text, word_count, {
+        'complaint': complaint_score,
+        'praise': praise_score,
+        'question': question_score + (1 if '?' in text else 0),
+        'request': request_score
+    })
+
+    return {
+        "sentiment": sentiment,
+        "urgency": urgency,
+        "intent": intent,
+        "priority": calculate_priority(sentiment["score"], urgency["label"], sentiment["label"])
+    }
+
+def _sentiment_result(text: str, word_count: int, positive_count: int, negative_count: int) -> Dict:
+    if not text or len(text.strip()) == 0:
+        return {
+            "score": 0.0,
+            "label": "neutral",
+            "confidence": 0.5,
+            "metadata": {"word_count": 0, "positive_words": 0, "negative_words": 0}
+        }
+
     total_sentiment_words = positive_count + negative_count
 
     if total_sentiment_words == 0:
@@ -100,21 +310,18 @@ def classify_sentiment(text: str) -> Dict:
         "label": label,
         "confidence": round(confidence, 3),
         "metadata": {
-            "word_count": len(words),
+            "word_count": word_count,
             "positive_words": positive_count,
             "negative_words": negative_count,
-            "sentiment_words_ratio": round(total_sentiment_words / len(words), 3) if len(words) > 0 else 0
+            "sentiment_words_ratio": round(total_sentiment_words / word_count, 3) if word_count > 0 else 0
         }
     }
 
-def detect_urgency(text: str, metadata: Dict = None) -> Dict:
-    words = preprocess_text(text)
-
-    urgency_count = sum(1 for word in words if word in urgency_keywords)
+def _urgency_result(text: str, word_count: int, urgency_count: int) -> Dict:
     has_exclamation = '!' in text
-    has_caps = sum(1 for c in text if c.isupper()) / len(text) > 0.3 if len(text) > 0 else False
+    has_caps = sum(map(str.isupper, text)) / len(text) > 0.3 if len(text) > 0 else False
 
-    urgency_score = urgency_count / len(words) if len(words) > 0 else 0
+    urgency_score = urgency_count / word_count if word_count > 0 else 0
 
     if has_exclamation:
         urgency_score += 0.1
@@ -136,51 +343,70 @@ def detect_urgency(text: str, metadata: Dict = None) -> Dict:
         "score": round(score, 3)
     }
 
-def classify_intent(text: str) -> Dict:
-    words = preprocess_text(text)
-
-    complaint_keywords = {'complaint', 'issue', 'problem', 'broken', 'not working', 'error', 'bug'}
-    praise_keywords = {'thank', 'thanks', 'great', 'excellent', 'love', 'appreciate'}
-    question_keywords = {'how', 'what', 'when', 'where', 'why', 'can', 'could', 'would', '?'}
-    request_keywords = {'please', 'need', 'want', 'request', 'can you', 'could you'}
-
-    complaint_score = sum(1 for word in words if word in complaint_keywords)
-    praise_score = sum(1 for word in words if word in praise_keywords)
-    question_score = sum(1 for word in words if word in question_keywords) + (1 if '?' in text else 0)
-    request_score = sum(1 for word in words if word in request_keywords)
-
-    scores = {
-        'complaint': complaint_score,
-        'praise': praise_score,
-        'question': question_score,
-        'request': request_score
-    }
-
-    if max(scores.values()) == 0:
+def _intent_result(text: str, word_count: int, scores: Dict[str, int]) -> Dict:
+    if word_count == 0 or max(scores.values()) == 0:
         return {"label": "general", "score": 0.5}
 
     intent = max(scores, key=scores.get)
-    confidence = min(0.9, 0.5 + (scores[intent] / len(words)))
+    confidence = min(0.9, 0.5 + (scores[intent] / word_count))
 
     return {
         "label": intent,
         "score": round(confidence, 3)
     }
 
-def calculate_priority(sentiment_score: float, urgency: str, sentiment: str) -> int:
-    priority = 50
-
-    if urgency == "high":
-        priority += 40
-    elif urgency == "medium":
-        priority += 20
-
-    if sentiment == "negative":
-        priority += 20
-    elif sentiment == "positive":
-        priority -= 10
-
-    return min(100, max(0, priority))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0")) or os.cpu_count() or 1
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "500"))
+
+_batch_executor: Optional[ProcessPoolExecutor] = None
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+
+    return _batch_executor
+
+def _analyze_or_error(text: str, matcher: Optional[PhraseMatcher]) -> Dict:
+    try:
+        return analyze_text(text or "", matcher)
+    except Exception as e:
+        return {"error": str(e)}
+
+def _analyze_chunk(texts: List[str], matcher: Optional[PhraseMatcher] = None) -> List[Dict]:
+    return [_analyze_or_error(text, matcher) for text in texts]
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def classify_batch(
+    texts: Iterable[str],
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    executor: Optional[ProcessPoolExecutor] = None,
+    matcher: Optional[PhraseMatcher] = None
+) -> Iterator[Dict]:
+    executor = executor or get_batch_executor()
+    if matcher is _matcher:
+        matcher = None
+    max_in_flight = BATCH_WORKERS * 2
+    pending = deque()
+
+    try:
+        for chunk in _chunked(texts, chunk_size):
+            pending.append(executor.submit(_analyze_chunk, chunk, matcher))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
 
 def analyze_sentiment(text: str) -> Dict:
     return classify_sentiment(text)
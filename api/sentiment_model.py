@@ -0,0 +1,263 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from api.cache import LRUCache
+from api.database import get_async_supabase_client
+from api.sentiment_engine import PhraseMatcher, analyze_text, calculate_priority, preprocess_text
+
+SENTIMENT_MODEL_PATH = os.getenv("SENTIMENT_MODEL_PATH")
+SENTIMENT_ENGINE = os.getenv("SENTIMENT_ENGINE", "heuristic")
+TENANT_ENGINE_CACHE_TTL_SECONDS = float(os.getenv("TENANT_ENGINE_CACHE_TTL_SECONDS", "60"))
+
+SENTIMENT_ENGINES = ("heuristic", "model")
+MODEL_LABELS = ["negative", "neutral", "positive"]
+DEFAULT_HASH_FEATURES = 2 ** 18
+
+_word_hashes: Dict[str, int] = {}
+WORD_HASH_CACHE_SIZE = 1_000_000
+
+def _word_hash(word: str) -> int:
+    value = _word_hashes.get(word)
+    if value is None:
+        if len(_word_hashes) >= WORD_HASH_CACHE_SIZE:
+            _word_hashes.clear()
+        value = _word_hashes[word] = zlib.crc32(word.encode("utf-8"))
+    return value
+
+def hashed_features(text: str, n_features: int) -> List[int]:
+    hashes = list(map(_word_hash, preprocess_text(text or "")))
+    bigrams = [(a * 1000003) ^ b for a, b in zip(hashes, hashes[1:])]
+    return [value % n_features for value in hashes + bigrams]
+
+def featurize(texts: List[str], n_features: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    indices: List[int] = []
+    values: List[float] = []
+    offsets: List[int] = []
+
+    for text in texts:
+        features = hashed_features(text, n_features)
+        offsets.append(len(indices))
+        indices.append(n_features)
+        values.append(1.0)
+        if features:
+            indices.extend(features)
+            values.extend([1.0 / len(features) ** 0.5] * len(features))
+
+    return (
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(values, dtype=np.float32),
+        np.asarray(offsets, dtype=np.int64)
+    )
+
+def _scores(weights: np.ndarray, indices: np.ndarray, values: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    return np.add.reduceat(weights[indices] * values[:, None], offsets, axis=0)
+
+def _softmax(scores: np.ndarray) -> np.ndarray:
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+class SentimentModel:
+    def __init__(self, weights: np.ndarray, labels: List[str], version: str):
+        self.weights = weights
+        self.labels = labels
+        self.version = version
+        self.n_features = weights.shape[0] - 1
+        self._positive = labels.index("positive")
+        self._negative = labels.index("negative")
+
+    @classmethod
+    def load(cls, path: str) -> "SentimentModel":
+        with open(os.path.join(path, "model.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+
+        weights = np.load(os.path.join(path, "weights.npy"), mmap_mode="r")
+        if weights.shape != (meta["n_features"] + 1, len(meta["labels"])):
+            raise Exception(f"Model weights in {path} do not match model.json")
+
+        return cls(weights, meta["labels"], meta["version"])
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+
+        return _softmax(_scores(self.weights, *featurize(texts, self.n_features)))
+
+    def sentiment(self, texts: List[str]) -> List[Dict[str, Any]]:
+        probabilities = self.predict_proba(texts).astype(np.float64)
+        best = probabilities.argmax(axis=1)
+        scores = np.round(probabilities[:, self._positive] - probabilities[:, self._negative], 3).tolist()
+        confidences = np.round(probabilities[np.arange(len(best)), best], 3).tolist()
+
+        return [
+            {
+                "score": score,
+                "label": self.labels[label],
+                "confidence": confidence,
+                "metadata": {"engine": "model", "model_version": self.version}
+            }
+            for score, label, confidence in zip(scores, best.tolist(), confidences)
+        ]
+
+def _with_sentiment(analysis: Dict[str, Any], sentiment: Dict[str, Any]) -> Dict[str, Any]:
+    if "error" in analysis:
+        return analysis
+
+    return {
+        **analysis,
+        "sentiment": sentiment,
+        "priority": calculate_priority(sentiment["score"], analysis["urgency"]["label"], sentiment["label"])
+    }
+
+def analyze_with_model(text: str, model: SentimentModel, matcher: Optional[PhraseMatcher] = None) -> Dict[str, Any]:
+    return _with_sentiment(analyze_text(text, matcher), model.sentiment([text])[0])
+
+def overlay_model_sentiment(
+    results: Iterable[Dict[str, Any]],
+    texts: List[str],
+    model: SentimentModel,
+    chunk_size: int
+) -> Iterator[Dict[str, Any]]:
+    chunk: List[Dict[str, Any]] = []
+    start = 0
+
+    for result in results:
+        chunk.append(result)
+        if len(chunk) == chunk_size:
+            yield from map(_with_sentiment, chunk, model.sentiment(texts[start:start + chunk_size]))
+            start += chunk_size
+            chunk = []
+
+    if chunk:
+        yield from map(_with_sentiment, chunk, model.sentiment(texts[start:start + len(chunk)]))
+
+_sentiment_model: Optional[SentimentModel] = None
+_sentiment_model_loaded = False
+
+def get_sentiment_model() -> Optional[SentimentModel]:
+    global _sentiment_model, _sentiment_model_loaded
+    if not _sentiment_model_loaded:
+        _sentiment_model_loaded = True
+        if SENTIMENT_MODEL_PATH:
+            try:
+                _sentiment_model = SentimentModel.load(SENTIMENT_MODEL_PATH)
+                print(f"Loaded sentiment model {_sentiment_model.version} from {SENTIMENT_MODEL_PATH}")
+            except Exception as e:
+                print(f"Failed to load sentiment model from {SENTIMENT_MODEL_PATH}: {str(e)}")
+
+    return _sentiment_model
+
+_tenant_engines = LRUCache(10000, TENANT_ENGINE_CACHE_TTL_SECONDS)
+
+async def get_tenant_sentiment_engine(tenant_id: str) -> str:
+    engine = _tenant_engines.get(tenant_id)
+    if engine is not None:
+        return engine
+
+    supabase = get_async_supabase_client()
+
+    response = await supabase.table("tenants")\
+        .select("settings")\
+        .eq("id", tenant_id)\
+        .maybe_single()\
+        .execute()
+
+    settings = (response.data or {}).get("settings") or {}
+    engine = settings.get("sentiment_engine") or SENTIMENT_ENGINE
+    if engine not in SENTIMENT_ENGINES:
+        engine = SENTIMENT_ENGINE
+
+    _tenant_engines.set(tenant_id, engine)
+    return engine
+
+async def get_tenant_model(tenant_id: str) -> Optional[SentimentModel]:
+    if await get_tenant_sentiment_engine(tenant_id) != "model":
+        return None
+
+    return get_sentiment_model()
+
+def train_model(
+    texts: List[str],
+    labels: List[str],
+    n_features: int = DEFAULT_HASH_FEATURES,
+    epochs: int = 5,
+    learning_rate: float = 0.5,
+    l2: float = 1e-6,
+    batch_size: int = 256,
+    seed: int = 13
+) -> np.ndarray:
+    targets = np.asarray([MODEL_LABELS.index(label) for label in labels], dtype=np.int64)
+    weights = np.zeros((n_features + 1, len(MODEL_LABELS)), dtype=np.float32)
+    squared = np.zeros_like(weights)
+    order = list(range(len(texts)))
+    rng = random.Random(seed)
+
+    for _ in range(epochs):
+        rng.shuffle(order)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            indices, values, offsets = featurize([texts[i] for i in batch], n_features)
+
+            probabilities = _softmax(_scores(weights, indices, values, offsets))
+            probabilities[np.arange(len(batch)), targets[batch]] -= 1.0
+
+            rows = np.repeat(np.arange(len(batch)), np.diff(np.append(offsets, len(indices))))
+            gradient = np.zeros_like(weights)
+            np.add.at(gradient, indices, values[:, None] * probabilities[rows] / len(batch))
+            gradient += l2 * weights
+
+            squared += gradient * gradient
+            weights -= learning_rate * gradient / (np.sqrt(squared) + 1e-8)
+
+    return weights
+
+def save_model(weights: np.ndarray, path: str, examples: int) -> str:
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "weights.npy"), weights.astype(np.float32))
+
+    version = hashlib.sha256(weights.tobytes()).hexdigest()[:16]
+    with open(os.path.join(path, "model.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": version,
+            "labels": MODEL_LABELS,
+            "n_features": weights.shape[0] - 1,
+            "examples": examples,
+            "trained_at": datetime.utcnow().isoformat()
+        }, f, indent=2)
+
+    return version
+
+def load_labeled(path: str) -> Tuple[List[str], List[str]]:
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+
+    rows = [row for row in rows if row.get("label") in MODEL_LABELS and row.get("text")]
+    return [row["text"] for row in rows], [row["label"] for row in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the hashed-feature sentiment model from labeled feedback")
+    parser.add_argument("input", help="CSV or NDJSON with 'text' and 'label' (negative/neutral/positive)")
+    parser.add_argument("output", help="Directory to write weights.npy and model.json")
+    parser.add_argument("--features", type=int, default=DEFAULT_HASH_FEATURES)
+    parser.add_argument("--epochs", type=int, default=5)
+    args = parser.parse_args()
+
+    texts, labels = load_labeled(args.input)
+    weights = train_model(texts, labels, args.features, args.epochs)
+    version = save_model(weights, args.output, len(texts))
+    print(f"Trained model {version} on {len(texts)} examples -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.database import get_async_supabase_client
+from api.sentiment_engine import PhraseMatcher, compile_lexicon, get_default_matcher
+
+TENANT_LEXICON_REFRESH_SECONDS = float(os.getenv("TENANT_LEXICON_REFRESH_SECONDS", "30"))
+
+class TenantLexicons:
+    def __init__(self, refresh_interval: float = TENANT_LEXICON_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._matchers: Dict[str, Tuple[int, PhraseMatcher, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def invalidate(self, tenant_id: str):
+        entry = self._matchers.get(tenant_id)
+        if entry:
+            version, matcher, _ = entry
+            self._matchers[tenant_id] = (version, matcher, 0.0)
+
+    async def matcher(self, tenant_id: str) -> PhraseMatcher:
+        entry = self._matchers.get(tenant_id)
+        if entry and time.monotonic() - entry[2] < self.refresh_interval:
+            return entry[1]
+
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            entry = self._matchers.get(tenant_id)
+            if entry and time.monotonic() - entry[2] < self.refresh_interval:
+                return entry[1]
+
+            try:
+                version = await self._fetch_version(tenant_id)
+                if entry and entry[0] == version:
+                    matcher = entry[1]
+                elif version == 0:
+                    matcher = get_default_matcher()
+                else:
+                    entries = await self._fetch_entries(tenant_id)
+                    matcher = await asyncio.to_thread(build_matcher, entries)
+            except Exception as e:
+                if not entry:
+                    print(f"Failed to load lexicon for tenant {tenant_id}, using default: {str(e)}")
+                    return get_default_matcher()
+                print(f"Failed to refresh lexicon for tenant {tenant_id}: {str(e)}")
+                version, matcher = entry[0], entry[1]
+
+            self._matchers[tenant_id] = (version, matcher, time.monotonic())
+            return matcher
+
+    async def _fetch_version(self, tenant_id: str) -> int:
+        supabase = get_async_supabase_client()
+
+        response = await supabase.table("tenant_lexicon_versions")\
+            .select("version")\
+            .eq("tenant_id", tenant_id)\
+            .maybe_single()\
+            .execute()
+
+        return response.data["version"] if response.data else 0
+
+    async def _fetch_entries(self, tenant_id: str) -> List[Dict[str, Any]]:
+        supabase = get_async_supabase_client()
+
+        response = await supabase.table("tenant_lexicon_entries")\
+            .select("phrase, category, action")\
+            .eq("tenant_id", tenant_id)\
+            .order("created_at")\
+            .execute()
+
+        return response.data or []
+
+def build_matcher(entries: List[Dict[str, Any]]) -> PhraseMatcher:
+    if not entries:
+        return get_default_matcher()
+
+    return PhraseMatcher(compile_lexicon(entries))
+
+_tenant_lexicons: Optional[TenantLexicons] = None
+
+def get_tenant_lexicons() -> TenantLexicons:
+    global _tenant_lexicons
+    if _tenant_lexicons is None:
+        _tenant_lexicons = TenantLexicons()
+
+    return _tenant_lexicons
@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import signal
+
+from api.database import close_async_supabase_client
+from api.classification_cache import get_classification_cache
+from api.response_cache import get_response_cache
+from api.email_processor import process_inbound_email
+from api.sentiment_model import get_sentiment_model
+from api.feedback_writer import get_feedback_writer
+from api.integration_router import get_integration_router
+from api.metrics import METRICS_ENABLED, METRICS_PORT, register_stats, start_metrics_server
+from api.email_queue import (
+    get_email_queue,
+    EmailWorkerPool,
+    EMAIL_QUEUE_BACKEND,
+    EMAIL_QUEUE_CONCURRENCY,
+    EMAIL_QUEUE_MAX_ATTEMPTS
+)
+
+async def run_worker(concurrency: int, max_attempts: int, requeue_processing: bool, metrics_port: int):
+    queue = get_email_queue()
+
+    if METRICS_ENABLED and metrics_port:
+        register_stats("classification_cache", lambda: get_classification_cache().stats())
+        register_stats("response_cache", lambda: get_response_cache().stats())
+        start_metrics_server(metrics_port)
+
+    if requeue_processing:
+        moved = await queue.requeue_processing()
+        print(f"Requeued {moved} in-flight email jobs")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    get_sentiment_model()
+
+    pool = EmailWorkerPool(queue, process_inbound_email, concurrency, max_attempts)
+    pool.start()
+    print(f"Email worker started ({EMAIL_QUEUE_BACKEND} backend, concurrency {concurrency})")
+
+    await stop.wait()
+
+    print("Email worker stopping...")
+    await pool.stop()
+    await get_feedback_writer().close()
+    await queue.close()
+    await get_classification_cache().close()
+    await get_response_cache().close()
+    await get_integration_router().close()
+    await close_async_supabase_client()
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued inbound emails")
+    parser.add_argument("--concurrency", type=int, default=EMAIL_QUEUE_CONCURRENCY)
+    parser.add_argument("--max-attempts", type=int, default=EMAIL_QUEUE_MAX_ATTEMPTS)
+    parser.add_argument(
+        "--requeue-processing",
+        action="store_true",
+        help="Move jobs left in-flight by a previous worker back to the pending queue"
+    )
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT, help="Serve Prometheus metrics on this port (0 disables)")
+    args = parser.parse_args()
+
+    asyncio.run(run_worker(args.concurrency, args.max_attempts, args.requeue_processing, args.metrics_port))
+
+if __name__ == "__main__":
+    main()
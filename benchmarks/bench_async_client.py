@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import time
+from typing import Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import httpx
+
+from api.async_postgrest import AsyncPostgrestClient
+
+class LatencyServer:
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.connections = 0
+        self.peak_connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.peak_connections = max(self.peak_connections, self.connections)
+
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(self.latency)
+
+                target = head.split(b" ", 2)[1].decode()
+                tenant = dict(parse_qsl(urlsplit(target).query)).get("tenant_id", "").removeprefix("eq.")
+                body = json.dumps([{"id": "1", "tenant_id": tenant}]).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+async def run_load(client: AsyncPostgrestClient, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await client.table("feedback_items")\
+                .select("id, tenant_id")\
+                .eq("tenant_id", "t1")\
+                .limit(1)\
+                .execute()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started
+
+async def main_async(args):
+    server = LatencyServer(args.latency_ms)
+    client = AsyncPostgrestClient(
+        await server.start(),
+        "anon-key",
+        max_connections=args.max_connections
+    )
+
+    try:
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            server.peak_connections = server.connections
+            elapsed = await run_load(client, args.requests, concurrency)
+            print(
+                f"concurrency {concurrency:>4}: {args.requests} queries in {elapsed:.2f}s "
+                f"({args.requests / elapsed:,.0f} queries/sec, peak {server.peak_connections} connections)"
+            )
+    finally:
+        await client.aclose()
+        await server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure async PostgREST client throughput against a local simulated-latency HTTP server")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", default="1,10,50,100")
+    parser.add_argument("--max-connections", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+import html2text
+
+from api.email_text import email_bodies
+from api.sentiment_engine import analyze_text
+
+OPENINGS = [
+    "My order has not arrived and I need it urgently.",
+    "Thank you so much, the support team was amazing and very helpful!",
+    "How do I change the billing address on my account?",
+    "Could you please add an export to Excel feature?",
+    "The app keeps crashing when I open the dashboard, this is unacceptable.",
+    "I was charged twice this month, please refund immediately.",
+    "Everything works fine, just wanted to say thanks.",
+    "Is there a way to invite more users to our workspace?"
+]
+
+def simple_email(rng: random.Random) -> Tuple[str, str]:
+    body = " ".join(rng.choice(OPENINGS) for _ in range(rng.randint(1, 4)))
+    return f"<html><body><p>Hi team,</p><p>{body}</p><p>Best regards,<br>Sam</p></body></html>", f"Hi team, {body} Best regards, Sam"
+
+def marketing_email(rng: random.Random) -> Tuple[str, str]:
+    rows = "".join(
+        f"<tr><td style='padding:8px;font-family:Arial'><a href='https://example.com/p/{i}'>"
+        f"<span style='color:#333'>Product {i}</span></a></td><td>${rng.randint(5, 500)}.99</td></tr>"
+        for i in range(rng.randint(200, 800))
+    )
+    style = "<style>" + ".c{margin:0;padding:0}" * 2000 + "</style>"
+    opening = rng.choice(OPENINGS)
+    return (
+        f"<html><head>{style}</head><body><table>{rows}</table>"
+        f"<p>{opening}</p></body></html>"
+    ), opening
+
+def inline_image_email(rng: random.Random) -> Tuple[str, str]:
+    image = "iVBORw0KGgoAAAANSUhEUgAA" * rng.randint(20000, 80000)
+    opening = rng.choice(OPENINGS)
+    return (
+        f"<html><body><p>{opening}</p>"
+        f"<img src=\"data:image/png;base64,{image}\"><p>Screenshot attached above.</p></body></html>"
+    ), f"{opening} Screenshot attached above."
+
+def reply_chain_email(rng: random.Random) -> Tuple[str, str]:
+    quoted = "".join(
+        f"<div class='gmail_quote'>On Mon, Jan {i + 1}, 2024 Support wrote:<blockquote>"
+        f"<p>{rng.choice(OPENINGS)}</p></blockquote></div>"
+        for i in range(rng.randint(3, 20))
+    )
+    opening = rng.choice(OPENINGS)
+    return f"<html><body><p>{opening}</p>{quoted}</body></html>", opening
+
+GENERATORS: List[Callable[[random.Random], Tuple[str, str]]] = [
+    simple_email, simple_email, marketing_email, inline_image_email, reply_chain_email
+]
+
+def build_corpus(size: int, seed: int) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        generator = GENERATORS[i % len(GENERATORS)]
+        html, author_text = generator(rng)
+        corpus.append({"kind": generator.__name__, "subject": f"Ticket {i}", "html": html, "author_text": author_text})
+
+    return corpus
+
+def html2text_body(email: Dict[str, str]) -> str:
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    return h.handle(email["html"]).strip()
+
+def lxml_body(email: Dict[str, str]) -> str:
+    return email_bodies("", email["html"])[1]
+
+def labels(subject: str, body: str) -> Tuple[str, str, str]:
+    analysis = analyze_text(f"{subject} {body}")
+    return analysis["sentiment"]["label"], analysis["urgency"]["label"], analysis["intent"]["label"]
+
+def run(corpus: List[Dict[str, str]], normalize: Callable[[Dict[str, str]], str]) -> Tuple[float, List[str]]:
+    started = time.perf_counter()
+    bodies = [normalize(email) for email in corpus]
+    return time.perf_counter() - started, bodies
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare html2text and the lxml email normalizer")
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.emails, args.seed)
+    html_mb = sum(len(email["html"]) for email in corpus) / 1e6
+    print(f"Corpus: {len(corpus)} emails, {html_mb:.1f} MB of HTML")
+
+    baseline_time, baseline_bodies = run(corpus, html2text_body)
+    lxml_time, lxml_bodies = run(corpus, lxml_body)
+
+    print(f"html2text: {baseline_time:.2f}s ({len(corpus) / baseline_time:,.0f} emails/sec)")
+    print(f"lxml:      {lxml_time:.2f}s ({len(corpus) / lxml_time:,.0f} emails/sec), {baseline_time / lxml_time:.1f}x faster")
+
+    results: Dict[str, List[int]] = {}
+    for email, before, after in zip(corpus, baseline_bodies, lxml_bodies):
+        expected = labels(email["subject"], email["author_text"])
+        counts = results.setdefault(email["kind"], [0, 0, 0])
+        counts[0] += labels(email["subject"], before) == labels(email["subject"], after)
+        counts[1] += labels(email["subject"], after) == expected
+        counts[2] += 1
+
+    print("Classification agreement (html2text vs lxml, lxml vs author's own text):")
+    for kind, (same, correct, total) in results.items():
+        print(f"  {kind:<20} {same / total:>6.1%}  {correct / total:>6.1%}  ({total} emails)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import os
+import resource
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from api.exports import write_export
+
+def synthetic_pages(total_rows: int, page_size: int) -> Iterator[List[Dict]]:
+    started = datetime(2025, 1, 1)
+    sentiments = ["positive", "negative", "neutral"]
+    urgencies = ["low", "medium", "high"]
+
+    for offset in range(0, total_rows, page_size):
+        yield [
+            {
+                "id": str(uuid.UUID(int=i)),
+                "created_at": (started + timedelta(seconds=i)).isoformat() + "+00:00",
+                "subject": f"Order #{i} problem",
+                "body_text": "Hi team, my order has not arrived yet and I need it urgently. Thanks!",
+                "sender_email": f"customer{i % 5000}@example.com",
+                "sender_name": f"Customer {i % 5000}",
+                "recipient_email": "support@example.com",
+                "sentiment": sentiments[i % 3],
+                "sentiment_score": 0.5,
+                "urgency": urgencies[i % 3],
+                "urgency_score": 0.3,
+                "intent": "complaint",
+                "priority": 70,
+                "status": "open",
+                "is_satisfied": False,
+                "satisfied_at": None
+            }
+            for i in range(offset, min(offset + page_size, total_rows))
+        ]
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure streaming export throughput and memory")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--formats", default="csv,ndjson,parquet")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for export_format in args.formats.split(","):
+            path = os.path.join(directory, f"export.{export_format}")
+            rss_before = max_rss_mb()
+            started = time.perf_counter()
+
+            try:
+                rows = write_export(synthetic_pages(args.rows, args.page_size), export_format, path)
+            except Exception as e:
+                print(f"{export_format}: skipped ({str(e)})")
+                continue
+
+            elapsed = time.perf_counter() - started
+            print(
+                f"{export_format}: {rows} rows in {elapsed:.1f}s "
+                f"({rows / elapsed:,.0f} rows/sec), "
+                f"{os.path.getsize(path) / 1e6:.1f} MB on disk, "
+                f"max RSS {max_rss_mb():.1f} MB (was {rss_before:.1f} MB)"
+            )
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from api.sentiment_engine import (
+    PhraseMatcher,
+    analyze_text,
+    classify_batch,
+    compile_lexicon,
+    URGENT,
+    calculate_priority,
+    positive_words,
+    negative_words,
+    urgency_keywords,
+    intensifiers,
+    negations,
+    complaint_keywords,
+    praise_keywords,
+    question_keywords,
+    request_keywords,
+    preprocess_text
+)
+
+filler_words = [
+    'the', 'order', 'account', 'we', 'your', 'team', 'support', 'ticket', 'invoice',
+    'i', 'my', 'is', 'was', 'have', 'been', 'since', 'yesterday', 'update', 'app', 'login'
+]
+
+NEGATION_SAMPLES = [
+    "n't good",
+    "I don't love it",
+    "It isn't broken, it's not bad at all",
+    "not good, never happy, nothing great",
+    "Not very helpful and no thanks"
+]
+
+def build_corpus(count: int, body_bytes: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    lexicon = sorted(positive_words | negative_words | urgency_keywords | intensifiers | negations)
+
+    corpus = []
+    for _ in range(count):
+        parts = []
+        size = 0
+        while size < body_bytes:
+            word = rng.choice(lexicon) if rng.random() < 0.15 else rng.choice(filler_words)
+            if rng.random() < 0.05:
+                word = word.upper()
+            if rng.random() < 0.08:
+                word += rng.choice(['.', ',', '!', '?'])
+            parts.append(word)
+            size += len(word) + 1
+        corpus.append(' '.join(parts)[:body_bytes])
+
+    return corpus
+
+def build_matcher(extra_phrases: int, seed: int = 7) -> PhraseMatcher:
+    rng = random.Random(seed)
+    lexicon = compile_lexicon()
+    while len(lexicon) < extra_phrases + len(compile_lexicon()):
+        words = [rng.choice(filler_words) for _ in range(rng.randint(1, 2))]
+        words.append(rng.choice(filler_words) + str(rng.randint(0, 9999)))
+        phrase = ' '.join(words)
+        lexicon[phrase] = lexicon.get(phrase, 0) | URGENT
+    return PhraseMatcher(lexicon)
+
+def original_classify_sentiment(text: str):
+    if not text or len(text.strip()) == 0:
+        return {
+            "score": 0.0,
+            "label": "neutral",
+            "confidence": 0.5,
+            "metadata": {"word_count": 0, "positive_words": 0, "negative_words": 0}
+        }
+
+    words = preprocess_text(text)
+
+    positive_count = 0
+    negative_count = 0
+    negate = False
+
+    for word in words:
+        if word in intensifiers:
+            continue
+
+        if word in negations:
+            negate = True
+            continue
+
+        if word in positive_words:
+            if negate:
+                negative_count += 1
+            else:
+                positive_count += 1
+        elif word in negative_words:
+            if negate:
+                positive_count += 1
+            else:
+                negative_count += 1
+
+        negate = False
+
+    total_sentiment_words = positive_count + negative_count
+
+    if total_sentiment_words == 0:
+        sentiment_score = 0.0
+        label = "neutral"
+        confidence = 0.5
+    else:
+        sentiment_score = (positive_count - negative_count) / total_sentiment_words
+
+        if sentiment_score > 0.3:
+            label = "positive"
+            confidence = min(0.95, 0.6 + (sentiment_score * 0.3))
+        elif sentiment_score < -0.3:
+            label = "negative"
+            confidence = min(0.95, 0.6 + (abs(sentiment_score) * 0.3))
+        else:
+            label = "neutral"
+            confidence = 0.5 + (0.3 * (1 - abs(sentiment_score)))
+
+    sentiment_score = max(-1.0, min(1.0, sentiment_score))
+
+    return {
+        "score": round(sentiment_score, 3),
+        "label": label,
+        "confidence": round(confidence, 3),
+        "metadata": {
+            "word_count": len(words),
+            "positive_words": positive_count,
+            "negative_words": negative_count,
+            "sentiment_words_ratio": round(total_sentiment_words / len(words), 3) if len(words) > 0 else 0
+        }
+    }
+
+def original_detect_urgency(text: str):
+    words = preprocess_text(text)
+
+    urgency_count = sum(1 for word in words if word in urgency_keywords)
+    has_exclamation = '!' in text
+    has_caps = sum(1 for c in text if c.isupper()) / len(text) > 0.3 if len(text) > 0 else False
+
+    urgency_score = urgency_count / len(words) if len(words) > 0 else 0
+
+    if has_exclamation:
+        urgency_score += 0.1
+    if has_caps:
+        urgency_score += 0.15
+
+    if urgency_score > 0.15:
+        label = "high"
+        score = min(0.95, 0.7 + urgency_score)
+    elif urgency_score > 0.05:
+        label = "medium"
+        score = 0.5 + urgency_score
+    else:
+        label = "low"
+        score = 0.3
+
+    return {
+        "label": label,
+        "score": round(score, 3)
+    }
+
+def original_classify_intent(text: str):
+    words = preprocess_text(text)
+
+    complaint_score = sum(1 for word in words if word in complaint_keywords)
+    praise_score = sum(1 for word in words if word in praise_keywords)
+    question_score = sum(1 for word in words if word in question_keywords) + (1 if '?' in text else 0)
+    request_score = sum(1 for word in words if word in request_keywords)
+
+    scores = {
+        'complaint': complaint_score,
+        'praise': praise_score,
+        'question': question_score,
+        'request': request_score
+    }
+
+    if max(scores.values()) == 0:
+        return {"label": "general", "score": 0.5}
+
+    intent = max(scores, key=scores.get)
+    confidence = min(0.9, 0.5 + (scores[intent] / len(words)))
+
+    return {
+        "label": intent,
+        "score": round(confidence, 3)
+    }
+
+def legacy_pipeline(text: str):
+    sentiment = original_classify_sentiment(text)
+    urgency = original_detect_urgency(text)
+    intent = original_classify_intent(text)
+    priority = calculate_priority(sentiment["score"], urgency["label"], sentiment["label"])
+    return sentiment, urgency, intent, priority
+
+def single_pass_pipeline(text: str):
+    result = analyze_text(text)
+    return result["sentiment"], result["urgency"], result["intent"], result["priority"]
+
+def time_pipeline(pipeline, corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        for text in corpus:
+            pipeline(text)
+        best = min(best, time.process_time() - start)
+    return best / len(corpus)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the original three-pass classifiers against analyze_text")
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--body-bytes", type=int, default=10 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--extra-phrases", type=int, default=5000)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.emails, args.body_bytes)
+
+    edge_cases = ["?", "", "...", *NEGATION_SAMPLES]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        batch = list(classify_batch(edge_cases, chunk_size=2, executor=executor))
+    if len(batch) != len(edge_cases) or any("error" in result for result in batch):
+        raise SystemExit("classify_batch failed on punctuation-only or empty texts")
+
+    for text in corpus + NEGATION_SAMPLES:
+        if original_classify_sentiment(text) != analyze_text(text)["sentiment"]:
+            raise SystemExit(f"analyze_text negation handling differs from the original classify_sentiment: {text!r}")
+
+    legacy = time_pipeline(legacy_pipeline, corpus, args.repeat)
+    single = time_pipeline(single_pass_pipeline, corpus, args.repeat)
+
+    matcher = build_matcher(args.extra_phrases)
+    extended = time_pipeline(lambda text: analyze_text(text, matcher), corpus, args.repeat)
+
+    print(f"emails: {args.emails} x {args.body_bytes} bytes")
+    print(f"three passes:   {legacy * 1e6:.1f} us/email")
+    print(f"analyze_text:   {single * 1e6:.1f} us/email")
+    print(f"saving:         {(legacy - single) * 1e6:.1f} us/email ({(1 - single / legacy) * 100:.1f}%)")
+    print(f"analyze_text with {args.extra_phrases} extra phrases: {extended * 1e6:.1f} us/email")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from jose import jwt
+
+from api import database
+from api.database import close_async_supabase_client
+from api.main import app, get_response_cache, start_email_workers, stop_email_workers
+from api.sentiment_engine import analyze_text, classify_intent, classify_sentiment, detect_urgency
+from benchmarks.bench_sentiment_engine import build_corpus
+from benchmarks.fake_postgrest import FakePostgrest, seed_tenant
+
+JWT_SECRET = "bench-secret"
+INBOUND_ADDRESS = "support@bench.example.com"
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_per_sec": round(len(values) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0
+    }
+
+def bench_classifiers(emails: int, body_bytes: int) -> Dict[str, Any]:
+    corpus = build_corpus(emails, body_bytes)
+    results = {}
+
+    for name, classifier in (
+        ("classify_sentiment", classify_sentiment),
+        ("detect_urgency", detect_urgency),
+        ("classify_intent", classify_intent),
+        ("analyze_text", analyze_text)
+    ):
+        latencies = []
+        started = time.perf_counter()
+        for text in corpus:
+            call_started = time.perf_counter()
+            classifier(text)
+            latencies.append(time.perf_counter() - call_started)
+        results[name] = summarize(latencies, time.perf_counter() - started)
+
+    return {"emails": emails, "body_bytes": body_bytes, "functions": results}
+
+async def run_requests(
+    total: int,
+    concurrency: int,
+    request: Callable[[int], Awaitable[httpx.Response]],
+    expected_status: int = 200
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            call_started = time.perf_counter()
+            response = await request(i)
+            if response.status_code == expected_status:
+                latencies.append(time.perf_counter() - call_started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+def auth_headers(user_id: str) -> Dict[str, str]:
+    token = jwt.encode(
+        {"sub": user_id, "aud": "authenticated", "exp": datetime.utcnow() + timedelta(hours=1)},
+        JWT_SECRET,
+        algorithm="HS256"
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+async def wait_for_rows(fake: FakePostgrest, table: str, expected: int, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while fake.count(table) < expected:
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+async def bench_ingest(http: httpx.AsyncClient, fake: FakePostgrest, emails: int, concurrency: int, body_bytes: int) -> Dict[str, Any]:
+    corpus = build_corpus(emails, body_bytes, seed=5)
+    before = fake.count("feedback_items")
+
+    async def post(i: int) -> httpx.Response:
+        return await http.post(
+            "/webhook/sendgrid",
+            data={
+                "from": f"Customer {i} <customer{i}@example.com>",
+                "to": INBOUND_ADDRESS,
+                "subject": f"Order #{i}",
+                "text": corpus[i],
+                "headers": f"Message-ID: <bench-{i}-{time.time_ns()}@example.com>",
+                "attachments": "1"
+            },
+            files={"attachment1": ("note.txt", b"see attached", "text/plain")}
+        )
+
+    started = time.perf_counter()
+    accepted = await run_requests(emails, concurrency, post)
+    drained = await wait_for_rows(fake, "feedback_items", before + accepted["count"], timeout=120)
+    elapsed = time.perf_counter() - started
+    processed = fake.count("feedback_items") - before
+
+    return {
+        "emails": emails,
+        "concurrency": concurrency,
+        "webhook": accepted,
+        "processed": processed,
+        "drained": drained,
+        "end_to_end_emails_per_sec": round(processed / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+async def bench_analytics(
+    http: httpx.AsyncClient,
+    source_rows: int,
+    requests: int,
+    concurrency: int,
+    latency_ms: float
+) -> Dict[str, Any]:
+    await close_async_supabase_client()
+    fake = FakePostgrest(latency_ms)
+    fake.install()
+
+    started = time.perf_counter()
+    tenant_id, user_id = seed_tenant(fake, rollup_source_rows=source_rows)
+    seed_seconds = time.perf_counter() - started
+    headers = auth_headers(user_id)
+    cache = get_response_cache()
+    results: Dict[str, Any] = {
+        "source_rows": source_rows,
+        "rollup_rows": fake.count("feedback_daily_rollups"),
+        "seed_seconds": round(seed_seconds, 2)
+    }
+
+    for endpoint in ("summary", "trends"):
+        url = f"/api/analytics/{endpoint}?days=90"
+        first = await http.get(url, headers=headers)
+        etag = first.headers.get("etag", "")
+
+        async def uncached(i: int) -> httpx.Response:
+            await cache.invalidate(tenant_id, "analytics")
+            return await http.get(url, headers=headers)
+
+        async def cached(i: int) -> httpx.Response:
+            return await http.get(url, headers=headers)
+
+        async def revalidated(i: int) -> httpx.Response:
+            return await http.get(url, headers={**headers, "If-None-Match": etag})
+
+        results[endpoint] = {
+            "uncached": await run_requests(requests, 1, uncached),
+            "cached": await run_requests(requests, concurrency, cached),
+            "not_modified": await run_requests(requests, concurrency, revalidated, expected_status=304)
+        }
+
+    return results
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], path: str = ""):
+    for key, value in results.items():
+        other = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(value, dict):
+            compare(value, other or {}, f"{path}{key}.")
+        elif key in ("throughput_per_sec", "p50_ms", "p99_ms", "end_to_end_emails_per_sec") and other:
+            print(f"{path}{key}: {other} -> {value} ({(value - other) / other * 100:+.1f}%)")
+
+async def main_async(args) -> Dict[str, Any]:
+    scenarios = args.scenarios.split(",")
+    results: Dict[str, Any] = {}
+
+    if "classify" in scenarios:
+        results["classify"] = bench_classifiers(args.emails, args.body_bytes)
+
+    if "ingest" not in scenarios and "analytics" not in scenarios:
+        return results
+
+    database.SUPABASE_JWT_SECRET = JWT_SECRET
+    fake = FakePostgrest(args.latency_ms)
+    fake.install()
+    seed_tenant(fake, inbound_address=INBOUND_ADDRESS)
+
+    output = io.StringIO() if not args.verbose else None
+    with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+        await start_email_workers()
+        transport = httpx.ASGITransport(app=app)
+
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench.local") as http:
+                if "ingest" in scenarios:
+                    results["ingest"] = await bench_ingest(http, fake, args.ingest_emails, args.concurrency, args.body_bytes)
+
+                if "analytics" in scenarios:
+                    results["analytics_rollups"] = {
+                        str(rows): await bench_analytics(http, rows, args.requests, args.concurrency, args.latency_ms)
+                        for rows in (int(value) for value in args.analytics_rows.split(","))
+                    }
+        finally:
+            await stop_email_workers()
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite: classifiers, webhook ingest and analytics endpoints against an in-memory PostgREST")
+    parser.add_argument("--scenarios", default="classify,ingest,analytics")
+    parser.add_argument("--emails", type=int, default=2000, help="Corpus size for the classifier benchmark")
+    parser.add_argument("--body-bytes", type=int, default=2048)
+    parser.add_argument("--ingest-emails", type=int, default=2000)
+    parser.add_argument(
+        "--analytics-rows",
+        default="10000,1000000",
+        help="Synthetic feedback rows folded into feedback_daily_rollups per run; feedback_items itself is not seeded"
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Simulated database round-trip latency")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--verbose", action="store_true", help="Show API log output while running")
+    args = parser.parse_args()
+
+    started_at = datetime.utcnow().isoformat()
+    results = asyncio.run(main_async(args))
+
+    report = {
+        "started_at": started_at,
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "args": vars(args),
+        "results": results
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    print(f"Wrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(results, json.load(f)["results"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+from typing import Iterator
+
+from starlette.requests import Request
+
+from api.inbound_multipart import parse_inbound_email
+
+BOUNDARY = b"bench-boundary"
+CHUNK_BYTES = 64 * 1024
+
+ATTACHMENT_CHUNK = os.urandom(CHUNK_BYTES)
+
+def multipart_email(html_mb: int, attachments: int, attachment_mb: int) -> Iterator[bytes]:
+    def field(name: bytes, value: bytes) -> bytes:
+        return b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="' + name + b'"\r\n\r\n' + value + b"\r\n"
+
+    yield field(b"from", b"Customer <customer@example.com>") + field(b"to", b"support@example.com")
+    yield field(b"subject", b"Invoice attached") + field(b"text", b"Please see the attached invoices. " * 200)
+
+    yield b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="html"\r\n\r\n'
+    for _ in range(html_mb * 1024 * 1024 // CHUNK_BYTES):
+        yield b"<p>Invoice line</p>" * (CHUNK_BYTES // 19)
+    yield b"\r\n"
+
+    for i in range(attachments):
+        yield b"--" + BOUNDARY + f'\r\nContent-Disposition: form-data; name="attachment{i + 1}"; filename="invoice-{i + 1}.pdf"\r\nContent-Type: application/pdf\r\n\r\n'.encode()
+        for _ in range(attachment_mb * 1024 * 1024 // CHUNK_BYTES):
+            yield ATTACHMENT_CHUNK
+        yield b"\r\n"
+
+    yield field(b"attachments", str(attachments).encode()) + b"--" + BOUNDARY + b"--\r\n"
+
+def streamed_request(chunks: Iterator[bytes]) -> Request:
+    async def receive():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.request", "body": chunk, "more_body": True}
+
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=" + BOUNDARY)]
+    }, receive)
+
+async def buffered_form(request: Request):
+    form = await request.form()
+    fields = {name: value for name, value in form.items() if isinstance(value, str)}
+    await form.close()
+    return fields
+
+async def measure(name: str, parse, args):
+    tracemalloc.start()
+    await parse(streamed_request(multipart_email(args.html_mb, args.attachments, args.attachment_mb)))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(args.emails):
+        await parse(streamed_request(multipart_email(args.html_mb, args.attachments, args.attachment_mb)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:<20} peak {peak / 1e6:6.1f} MB/request, {args.emails / elapsed:5.1f} emails/sec")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare buffered request.form() with the streaming inbound parser on large emails")
+    parser.add_argument("--emails", type=int, default=5)
+    parser.add_argument("--html-mb", type=int, default=8)
+    parser.add_argument("--attachments", type=int, default=2)
+    parser.add_argument("--attachment-mb", type=int, default=10)
+    args = parser.parse_args()
+
+    size = args.html_mb + args.attachments * args.attachment_mb
+    print(f"{args.emails} emails of ~{size} MB ({args.html_mb} MB html, {args.attachments} x {args.attachment_mb} MB attachments)")
+
+    asyncio.run(measure("request.form()", buffered_form, args))
+    asyncio.run(measure("parse_inbound_email", parse_inbound_email, args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from api import database
+from api.async_postgrest import AsyncPostgrestClient, _format_value
+
+INDEXED_COLUMN = "tenant_id"
+ROLLUP_KEY = ("tenant_id", "day", "sentiment", "urgency", "intent")
+ROLLUP_COUNTS = ("item_count", "open_count", "satisfied_count")
+
+RollupChange = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+def _rollup_key(row: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+    return (
+        row["tenant_id"],
+        row["created_at"][:10],
+        row.get("sentiment") or "",
+        row.get("urgency") or "",
+        row.get("intent") or ""
+    )
+
+def _rollup_counts(row: Optional[Dict[str, Any]]) -> Tuple[int, int, int]:
+    if not row:
+        return 0, 0, 0
+
+    return 1, int(row.get("status") == "open"), int(bool(row.get("is_satisfied")))
+
+def rollup_deltas(changes: Iterable[RollupChange]) -> List[Dict[str, Any]]:
+    totals: Dict[Tuple[str, str, str, str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+
+    for before, after in changes:
+        key = _rollup_key(after or before)
+        old = _rollup_counts(before)
+        new = _rollup_counts(after)
+        delta = totals[key]
+        for i in range(3):
+            delta[i] += new[i] - old[i]
+
+    return [
+        {
+            "tenant_id": tenant_id,
+            "day": day,
+            "sentiment": sentiment,
+            "urgency": urgency,
+            "intent": intent,
+            "item_count": item_count,
+            "open_count": open_count,
+            "satisfied_count": satisfied_count
+        }
+        for (tenant_id, day, sentiment, urgency, intent), (item_count, open_count, satisfied_count) in totals.items()
+        if item_count or open_count or satisfied_count
+    ]
+
+def _split_top_level(value: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for char in value:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+def _compare(left: Any, right: str) -> Tuple[Any, Any]:
+    if isinstance(left, (int, float)) and not isinstance(left, bool):
+        return left, float(right)
+    return _format_value(left), right
+
+def _matches(row: Dict[str, Any], column: str, expression: str) -> bool:
+    operator, _, raw = expression.partition(".")
+    value = row.get(column)
+
+    if operator == "eq":
+        return _format_value(value) == raw
+    if operator == "neq":
+        return _format_value(value) != raw
+    if operator == "is":
+        return _format_value(value) == raw
+    if operator == "in":
+        return _format_value(value) in [item.strip('"') for item in _split_top_level(raw[1:-1])]
+    if value is None:
+        return False
+
+    left, right = _compare(value, raw)
+    if operator == "gt":
+        return left > right
+    if operator == "gte":
+        return left >= right
+    if operator == "lt":
+        return left < right
+    if operator == "lte":
+        return left <= right
+
+    raise Exception(f"Filter operator '{operator}' is not supported by the fake PostgREST")
+
+def _project(row: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+    if columns == ["*"]:
+        return dict(row)
+
+    projected = {}
+    for column in columns:
+        if column == "*":
+            projected.update(row)
+        elif "(" in column:
+            projected[column.split("(", 1)[0]] = []
+        else:
+            projected[column] = row.get(column)
+    return projected
+
+class FakePostgrest:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.requests = 0
+        self._index: Dict[str, Dict[str, List[Dict[str, Any]]]] = defaultdict(lambda: defaultdict(list))
+        self._rollups: Dict[Tuple, Dict[str, Any]] = {}
+        self.rpcs: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "feedback_analytics_counts": self._feedback_analytics_counts,
+            "apply_feedback_rollup_deltas": self._apply_feedback_rollup_deltas,
+            "attach_feedback_reply": lambda params: None
+        }
+
+    def insert(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("created_at", datetime.utcnow().isoformat() + "+00:00")
+        self.tables[table].append(row)
+        if row.get(INDEXED_COLUMN) is not None:
+            self._index[table][str(row[INDEXED_COLUMN])].append(row)
+        return row
+
+    def count(self, table: str) -> int:
+        return len(self.tables[table])
+
+    def client(self) -> AsyncPostgrestClient:
+        return AsyncPostgrestClient("http://postgrest.local", "bench-key", transport=httpx.MockTransport(self.handle))
+
+    def install(self) -> AsyncPostgrestClient:
+        database._async_supabase_client = self.client()
+        return database._async_supabase_client
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        path = request.url.path.split("/rest/v1/", 1)[1]
+        body = json.loads(request.content) if request.content else None
+
+        try:
+            if path.startswith("rpc/"):
+                function = self.rpcs.get(path[4:])
+                if function is None:
+                    return httpx.Response(404, json={"message": f"Function {path[4:]} not found"})
+                return httpx.Response(200, json=function(body or {}))
+
+            if request.method == "GET":
+                rows, total = self._select(path, request.url.params.multi_items())
+                headers = {"content-range": f"0-{max(len(rows) - 1, 0)}/{total}"}
+                return httpx.Response(200, json=rows, headers=headers)
+
+            if request.method == "POST":
+                rows = [self.insert(path, dict(row)) for row in (body if isinstance(body, list) else [body])]
+                if path == "feedback_items":
+                    self._apply_feedback_rollup_deltas({"p_deltas": rollup_deltas((None, row) for row in rows)})
+                if "return=minimal" in request.headers.get("prefer", ""):
+                    return httpx.Response(201)
+                return httpx.Response(201, json=rows)
+        except Exception as e:
+            return httpx.Response(400, json={"message": str(e)})
+
+        return httpx.Response(405, json={"message": f"{request.method} is not supported by the fake PostgREST"})
+
+    def _select(self, table: str, params: List[Tuple[str, str]]) -> Tuple[List[Dict[str, Any]], int]:
+        columns, order, limit, offset = ["*"], [], None, 0
+        filters = []
+
+        for key, value in params:
+            if key == "select":
+                columns = _split_top_level(value)
+            elif key == "order":
+                order = [item.split(".") for item in value.split(",")]
+            elif key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif key == "or":
+                raise Exception("or filters are not supported by the fake PostgREST")
+            else:
+                filters.append((key, value))
+
+        rows = self.tables[table]
+        for key, value in filters:
+            if key == INDEXED_COLUMN and value.startswith("eq."):
+                rows = self._index[table].get(value[3:], [])
+                break
+
+        rows = [row for row in rows if all(_matches(row, key, value) for key, value in filters)]
+
+        for column, *direction in reversed(order):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse="desc" in direction)
+
+        total = len(rows)
+        rows = rows[offset:offset + limit if limit is not None else None]
+        return [_project(row, columns) for row in rows], total
+
+    def _feedback_analytics_counts(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        start_day = params["p_start_date"][:10]
+        totals: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+
+        for row in self._index["feedback_daily_rollups"].get(params["p_tenant_id"], []):
+            if row["day"] >= start_day:
+                counts = totals[(row["sentiment"], row["urgency"])]
+                for i, column in enumerate(ROLLUP_COUNTS):
+                    counts[i] += row[column]
+
+        return [
+            {"sentiment": sentiment, "urgency": urgency, **dict(zip(ROLLUP_COUNTS, counts))}
+            for (sentiment, urgency), counts in totals.items()
+        ]
+
+    def _apply_feedback_rollup_deltas(self, params: Dict[str, Any]):
+        for delta in params["p_deltas"]:
+            key = tuple(delta[column] for column in ROLLUP_KEY)
+            row = self._rollups.get(key)
+            if row is None:
+                row = self._rollups[key] = self.insert("feedback_daily_rollups", {
+                    **{column: delta[column] for column in ROLLUP_KEY},
+                    **{column: 0 for column in ROLLUP_COUNTS}
+                })
+            for column in ROLLUP_COUNTS:
+                row[column] += delta[column]
+
+def synthetic_feedback(tenant_id: str, rows: int, days: int, seed: int = 11) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    started = datetime.utcnow() - timedelta(days=days)
+
+    for _ in range(rows):
+        yield {
+            "tenant_id": tenant_id,
+            "created_at": (started + timedelta(seconds=rng.randrange(days * 86400))).isoformat(),
+            "sentiment": rng.choice(("positive", "negative", "neutral")),
+            "urgency": rng.choice(("low", "medium", "high")),
+            "intent": rng.choice(("complaint", "praise", "question", "request", "general")),
+            "status": "open" if rng.random() < 0.4 else "closed",
+            "is_satisfied": rng.random() < 0.5
+        }
+
+def seed_tenant(
+    fake: FakePostgrest,
+    rollup_source_rows: int = 0,
+    days: int = 90,
+    inbound_address: Optional[str] = None
+) -> Tuple[str, str]:
+    tenant_id = str(uuid.uuid4())
+    user_id = str(uuid.uuid4())
+
+    fake.insert("tenants", {"id": tenant_id, "settings": {}})
+    fake.insert("tenant_users", {"tenant_id": tenant_id, "user_id": user_id, "is_active": True})
+    fake.insert("email_integrations", {
+        "tenant_id": tenant_id,
+        "name": "Support inbox",
+        "provider": "sendgrid",
+        "settings": {"inbound_address": inbound_address} if inbound_address else {},
+        "is_active": True
+    })
+
+    if rollup_source_rows:
+        deltas = rollup_deltas((None, row) for row in synthetic_feedback(tenant_id, rollup_source_rows, days))
+        fake._apply_feedback_rollup_deltas({"p_deltas": deltas})
+
+    return tenant_id, user_id
@@ -7,8 +7,9 @@ echo "1. Install Python dependencies: pip install -r requirements.txt"
 echo "2. Install Node dependencies: npm install"
 echo ""
 echo "To run the application:"
-echo "1. Start the FastAPI backend: python3 -m uvicorn api.main:app --reload --port 8000"
+echo "1. Start the FastAPI backend: python3 -m uvicorn api.main:socket_app --reload --port 8000"
 echo "2. Start the frontend: npm run dev"
+echo "3. (Redis queue only) Start the email worker: EMAIL_QUEUE_BACKEND=redis python3 -m api.worker"
 echo ""
 echo "The application will be available at http://localhost:3000"
 echo "The API will be available at http://localhost:8000"
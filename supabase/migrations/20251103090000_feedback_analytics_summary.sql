@@ -0,0 +1,41 @@
+/*
+  # Server-side analytics summary
+
+  1. Indexes
+    - `idx_feedback_tenant_created` on feedback_items(tenant_id, created_at DESC) so the
+      dashboard window is an index range scan per tenant
+
+  2. Functions
+    - `feedback_analytics_counts(p_tenant_id, p_start_date)` returns one row per
+      (sentiment, urgency, status, is_satisfied) combination with its count, so the API
+      receives a few dozen rows instead of every feedback item in the window
+*/
+
+CREATE INDEX IF NOT EXISTS idx_feedback_tenant_created
+  ON feedback_items(tenant_id, created_at DESC);
+
+CREATE OR REPLACE FUNCTION feedback_analytics_counts(
+  p_tenant_id uuid,
+  p_start_date timestamptz
+)
+RETURNS TABLE (
+  sentiment text,
+  urgency text,
+  status text,
+  is_satisfied boolean,
+  item_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    f.sentiment,
+    f.urgency,
+    f.status,
+    COALESCE(f.is_satisfied, false) AS is_satisfied,
+    count(*) AS item_count
+  FROM feedback_items f
+  WHERE f.tenant_id = p_tenant_id
+    AND f.created_at >= p_start_date
+  GROUP BY f.sentiment, f.urgency, f.status, COALESCE(f.is_satisfied, false);
+$$;
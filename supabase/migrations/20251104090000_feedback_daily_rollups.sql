@@ -0,0 +1,145 @@
+/*
+  # Daily feedback rollups
+
+  1. New Tables
+    - `feedback_daily_rollups` - one row per (tenant, day, sentiment, urgency, intent) with
+      item, open and satisfied counts. Maintained by statement-level triggers on
+      feedback_items (20251112090000). Missing classification values are stored as ''.
+
+  2. Functions
+    - `apply_feedback_rollup_deltas(p_deltas jsonb)` - upserts an array of count deltas
+    - `rebuild_feedback_daily_rollups(p_tenant_id, p_start_day)` - recomputes rollups from
+      feedback_items (backfill / repair); both arguments are optional
+    - `feedback_analytics_counts` now reads rollups instead of scanning feedback_items
+
+  3. Security
+    - RLS enabled; tenant members can view their tenant's rollups. The write policy created
+      here is dropped and both functions are revoked from clients in 20251113090000
+*/
+
+CREATE TABLE IF NOT EXISTS feedback_daily_rollups (
+  tenant_id uuid REFERENCES tenants(id) ON DELETE CASCADE NOT NULL,
+  day date NOT NULL,
+  sentiment text NOT NULL DEFAULT '',
+  urgency text NOT NULL DEFAULT '',
+  intent text NOT NULL DEFAULT '',
+  item_count integer NOT NULL DEFAULT 0,
+  open_count integer NOT NULL DEFAULT 0,
+  satisfied_count integer NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT now(),
+  PRIMARY KEY (tenant_id, day, sentiment, urgency, intent)
+);
+
+ALTER TABLE feedback_daily_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can view tenant rollups"
+  ON feedback_daily_rollups FOR SELECT
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
+
+CREATE POLICY "Members can maintain tenant rollups"
+  ON feedback_daily_rollups FOR ALL
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
+
+CREATE OR REPLACE FUNCTION apply_feedback_rollup_deltas(p_deltas jsonb)
+RETURNS void
+LANGUAGE sql
+AS $$
+  INSERT INTO feedback_daily_rollups AS r (
+    tenant_id, day, sentiment, urgency, intent,
+    item_count, open_count, satisfied_count, updated_at
+  )
+  SELECT
+    (d->>'tenant_id')::uuid,
+    (d->>'day')::date,
+    COALESCE(d->>'sentiment', ''),
+    COALESCE(d->>'urgency', ''),
+    COALESCE(d->>'intent', ''),
+    sum(COALESCE((d->>'item_count')::integer, 0)),
+    sum(COALESCE((d->>'open_count')::integer, 0)),
+    sum(COALESCE((d->>'satisfied_count')::integer, 0)),
+    now()
+  FROM jsonb_array_elements(p_deltas) AS d
+  GROUP BY 1, 2, 3, 4, 5
+  ON CONFLICT (tenant_id, day, sentiment, urgency, intent) DO UPDATE SET
+    item_count = r.item_count + EXCLUDED.item_count,
+    open_count = r.open_count + EXCLUDED.open_count,
+    satisfied_count = r.satisfied_count + EXCLUDED.satisfied_count,
+    updated_at = now();
+$$;
+
+CREATE OR REPLACE FUNCTION rebuild_feedback_daily_rollups(
+  p_tenant_id uuid DEFAULT NULL,
+  p_start_day date DEFAULT NULL
+)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_rows integer;
+BEGIN
+  DELETE FROM feedback_daily_rollups
+  WHERE (p_tenant_id IS NULL OR tenant_id = p_tenant_id)
+    AND (p_start_day IS NULL OR day >= p_start_day);
+
+  INSERT INTO feedback_daily_rollups (
+    tenant_id, day, sentiment, urgency, intent,
+    item_count, open_count, satisfied_count
+  )
+  SELECT
+    f.tenant_id,
+    (f.created_at AT TIME ZONE 'UTC')::date,
+    COALESCE(f.sentiment, ''),
+    COALESCE(f.urgency, ''),
+    COALESCE(f.intent, ''),
+    count(*),
+    count(*) FILTER (WHERE f.status = 'open'),
+    count(*) FILTER (WHERE f.is_satisfied)
+  FROM feedback_items f
+  WHERE (p_tenant_id IS NULL OR f.tenant_id = p_tenant_id)
+    AND (p_start_day IS NULL OR f.created_at >= (p_start_day::timestamp AT TIME ZONE 'UTC'))
+  GROUP BY 1, 2, 3, 4, 5;
+
+  GET DIAGNOSTICS v_rows = ROW_COUNT;
+  RETURN v_rows;
+END;
+$$;
+
+DROP FUNCTION IF EXISTS feedback_analytics_counts(uuid, timestamptz);
+
+CREATE OR REPLACE FUNCTION feedback_analytics_counts(
+  p_tenant_id uuid,
+  p_start_date timestamptz
+)
+RETURNS TABLE (
+  sentiment text,
+  urgency text,
+  item_count bigint,
+  open_count bigint,
+  satisfied_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    r.sentiment,
+    r.urgency,
+    sum(r.item_count)::bigint,
+    sum(r.open_count)::bigint,
+    sum(r.satisfied_count)::bigint
+  FROM feedback_daily_rollups r
+  WHERE r.tenant_id = p_tenant_id
+    AND r.day >= (p_start_date AT TIME ZONE 'UTC')::date
+  GROUP BY r.sentiment, r.urgency;
+$$;
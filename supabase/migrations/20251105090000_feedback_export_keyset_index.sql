@@ -0,0 +1,10 @@
+/*
+  # Keyset index for exports
+
+  1. Indexes
+    - `idx_feedback_tenant_created_id` on feedback_items(tenant_id, created_at, id) so
+      export pages seek directly to the (created_at, id) cursor instead of using OFFSET
+*/
+
+CREATE INDEX IF NOT EXISTS idx_feedback_tenant_created_id
+  ON feedback_items(tenant_id, created_at, id);
@@ -0,0 +1,11 @@
+/*
+  # Inbox listing index
+
+  1. Indexes
+    - `idx_feedback_tenant_status_created` on feedback_items(tenant_id, status, created_at DESC, id DESC)
+      backs GET /api/feedback: tenant + status filter, newest first, with `id` as the
+      keyset tie-breaker so every cursor page is a single index seek
+*/
+
+CREATE INDEX IF NOT EXISTS idx_feedback_tenant_status_created
+  ON feedback_items(tenant_id, status, created_at DESC, id DESC);
@@ -0,0 +1,94 @@
+/*
+  # Full-text search over feedback
+
+  1. Columns
+    - `feedback_items.search_vector` (tsvector) - weighted subject (A), body_text (B) and
+      sender_email (C); added if missing and backfilled for existing rows
+
+  2. Triggers
+    - `feedback_search_vector_trigger` now only fires when subject, body_text or
+      sender_email change, so status updates no longer re-tokenize the body
+
+  3. Indexes
+    - `idx_feedback_tenant_search` GIN on (tenant_id, search_vector) via btree_gin so a
+      tenant-scoped query only visits that tenant's postings
+
+  4. Functions
+    - `search_feedback(p_tenant_id, p_query, ...)` - websearch syntax, ts_rank_cd ranking,
+      ts_headline snippets computed only for the returned page
+*/
+
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+ALTER TABLE feedback_items ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION feedback_search_vector_update() RETURNS trigger AS $$
+BEGIN
+  NEW.search_vector :=
+    setweight(to_tsvector('english', COALESCE(NEW.subject, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(NEW.body_text, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(NEW.sender_email, '')), 'C');
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS feedback_search_vector_trigger ON feedback_items;
+
+CREATE TRIGGER feedback_search_vector_trigger
+  BEFORE INSERT OR UPDATE OF subject, body_text, sender_email ON feedback_items
+  FOR EACH ROW EXECUTE FUNCTION feedback_search_vector_update();
+
+UPDATE feedback_items
+SET search_vector =
+  setweight(to_tsvector('english', COALESCE(subject, '')), 'A') ||
+  setweight(to_tsvector('english', COALESCE(body_text, '')), 'B') ||
+  setweight(to_tsvector('english', COALESCE(sender_email, '')), 'C')
+WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_feedback_tenant_search
+  ON feedback_items USING gin(tenant_id, search_vector);
+
+CREATE OR REPLACE FUNCTION search_feedback(
+  p_tenant_id uuid,
+  p_query text,
+  p_limit integer DEFAULT 20,
+  p_offset integer DEFAULT 0,
+  p_sentiment text DEFAULT NULL,
+  p_urgency text DEFAULT NULL,
+  p_status text DEFAULT NULL
+)
+RETURNS TABLE (
+  id uuid,
+  created_at timestamptz,
+  subject text,
+  sender_email text,
+  sentiment text,
+  urgency text,
+  status text,
+  rank real,
+  snippet text
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH q AS (
+    SELECT websearch_to_tsquery('english', p_query) AS query
+  ),
+  hits AS (
+    SELECT f.id, f.created_at, f.subject, f.sender_email, f.sentiment, f.urgency, f.status,
+           f.body_text, ts_rank_cd(f.search_vector, q.query) AS rank, q.query
+    FROM feedback_items f, q
+    WHERE f.tenant_id = p_tenant_id
+      AND f.search_vector @@ q.query
+      AND (p_sentiment IS NULL OR f.sentiment = p_sentiment)
+      AND (p_urgency IS NULL OR f.urgency = p_urgency)
+      AND (p_status IS NULL OR f.status = p_status)
+    ORDER BY rank DESC, f.created_at DESC
+    LIMIT p_limit OFFSET p_offset
+  )
+  SELECT h.id, h.created_at, h.subject, h.sender_email, h.sentiment, h.urgency, h.status, h.rank,
+         ts_headline('english', COALESCE(h.body_text, ''), h.query,
+                     'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2')
+  FROM hits h
+  ORDER BY h.rank DESC, h.created_at DESC;
+$$;
@@ -0,0 +1,75 @@
+/*
+  # Mark feedback satisfied in one statement
+
+  1. Functions
+    - `mark_feedback_satisfied(p_tenant_id, p_user_id, p_feedback_ids, p_note)` - closes
+      every listed feedback item that belongs to the tenant, adds the optional internal
+      note as a comment on each, writes one audit event per item and adjusts
+      feedback_daily_rollups, all in a single transaction. Returns the updated rows;
+      IDs that do not exist or belong to another tenant are skipped.
+*/
+
+CREATE OR REPLACE FUNCTION mark_feedback_satisfied(
+  p_tenant_id uuid,
+  p_user_id uuid,
+  p_feedback_ids uuid[],
+  p_note text DEFAULT NULL
+)
+RETURNS SETOF feedback_items
+LANGUAGE sql
+AS $$
+  WITH previous AS (
+    SELECT f.id, f.status, COALESCE(f.is_satisfied, false) AS was_satisfied
+    FROM feedback_items f
+    WHERE f.tenant_id = p_tenant_id
+      AND f.id = ANY(p_feedback_ids)
+    FOR UPDATE
+  ),
+  updated AS (
+    UPDATE feedback_items f SET
+      is_satisfied = true,
+      satisfied_at = now(),
+      satisfied_by = p_user_id,
+      status = 'closed',
+      updated_at = now()
+    FROM previous p
+    WHERE f.id = p.id
+    RETURNING f.*
+  ),
+  comments AS (
+    INSERT INTO feedback_comments (feedback_id, user_id, comment, is_internal)
+    SELECT u.id, p_user_id, p_note, true
+    FROM updated u
+    WHERE COALESCE(p_note, '') <> ''
+  ),
+  audit AS (
+    INSERT INTO audit_logs (tenant_id, user_id, action, resource_type, resource_id, metadata)
+    SELECT p_tenant_id, p_user_id, 'feedback.satisfied', 'feedback', u.id,
+           jsonb_build_object('feedback_id', u.id)
+    FROM updated u
+  ),
+  rollups AS (
+    INSERT INTO feedback_daily_rollups AS r (
+      tenant_id, day, sentiment, urgency, intent,
+      item_count, open_count, satisfied_count, updated_at
+    )
+    SELECT
+      u.tenant_id,
+      (u.created_at AT TIME ZONE 'UTC')::date,
+      COALESCE(u.sentiment, ''),
+      COALESCE(u.urgency, ''),
+      COALESCE(u.intent, ''),
+      0,
+      -count(*) FILTER (WHERE p.status = 'open'),
+      count(*) FILTER (WHERE NOT p.was_satisfied),
+      now()
+    FROM updated u
+    JOIN previous p ON p.id = u.id
+    GROUP BY 1, 2, 3, 4, 5
+    ON CONFLICT (tenant_id, day, sentiment, urgency, intent) DO UPDATE SET
+      open_count = r.open_count + EXCLUDED.open_count,
+      satisfied_count = r.satisfied_count + EXCLUDED.satisfied_count,
+      updated_at = now()
+  )
+  SELECT * FROM updated;
+$$;
@@ -0,0 +1,114 @@
+/*
+  # Ingest deduplication and email threading
+
+  1. Columns
+    - `feedback_items.message_id` (text) - RFC 5322 Message-ID of the email that created the item
+    - `feedback_items.content_hash` (text) - sha256 of sender, subject and body, used when the
+      provider does not supply a Message-ID
+
+  2. Indexes
+    - Unique (tenant_id, message_id) and (tenant_id, content_hash) so webhook retries cannot
+      create a second row even when they reach different workers
+
+  3. New Tables
+    - `feedback_thread_messages` - replies (In-Reply-To / References) attached to an existing
+      feedback item instead of being stored and classified as new feedback
+
+  4. Functions
+    - `attach_feedback_reply(p_tenant_id, p_references, p_message)` - finds the feedback item
+      a reply belongs to, stores the reply and bumps the item's updated_at; returns the
+      feedback id, or NULL when none of the referenced messages are known
+
+  5. Security
+    - RLS enabled on feedback_thread_messages; tenant members can view their tenant's replies
+*/
+
+ALTER TABLE feedback_items ADD COLUMN IF NOT EXISTS message_id text;
+ALTER TABLE feedback_items ADD COLUMN IF NOT EXISTS content_hash text;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_tenant_message_id
+  ON feedback_items(tenant_id, message_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_tenant_content_hash
+  ON feedback_items(tenant_id, content_hash);
+
+CREATE TABLE IF NOT EXISTS feedback_thread_messages (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  tenant_id uuid REFERENCES tenants(id) ON DELETE CASCADE NOT NULL,
+  feedback_id uuid REFERENCES feedback_items(id) ON DELETE CASCADE NOT NULL,
+  message_id text,
+  in_reply_to text,
+  sender_email text,
+  sender_name text,
+  subject text,
+  body_text text,
+  received_at timestamptz DEFAULT now(),
+  created_at timestamptz DEFAULT now(),
+  UNIQUE(tenant_id, message_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_feedback_thread_messages_feedback
+  ON feedback_thread_messages(feedback_id, received_at);
+
+ALTER TABLE feedback_thread_messages ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can view tenant thread messages"
+  ON feedback_thread_messages FOR SELECT
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
+
+CREATE OR REPLACE FUNCTION attach_feedback_reply(
+  p_tenant_id uuid,
+  p_references text[],
+  p_message jsonb
+)
+RETURNS uuid
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  v_feedback_id uuid;
+BEGIN
+  SELECT f.id INTO v_feedback_id
+  FROM feedback_items f
+  WHERE f.tenant_id = p_tenant_id
+    AND f.message_id = ANY(p_references)
+  LIMIT 1;
+
+  IF v_feedback_id IS NULL THEN
+    SELECT m.feedback_id INTO v_feedback_id
+    FROM feedback_thread_messages m
+    WHERE m.tenant_id = p_tenant_id
+      AND m.message_id = ANY(p_references)
+    LIMIT 1;
+  END IF;
+
+  IF v_feedback_id IS NULL THEN
+    RETURN NULL;
+  END IF;
+
+  INSERT INTO feedback_thread_messages (
+    tenant_id, feedback_id, message_id, in_reply_to,
+    sender_email, sender_name, subject, body_text
+  )
+  VALUES (
+    p_tenant_id,
+    v_feedback_id,
+    p_message->>'message_id',
+    p_message->>'in_reply_to',
+    p_message->>'sender_email',
+    p_message->>'sender_name',
+    p_message->>'subject',
+    p_message->>'body_text'
+  )
+  ON CONFLICT (tenant_id, message_id) DO NOTHING;
+
+  UPDATE feedback_items SET updated_at = now() WHERE id = v_feedback_id;
+
+  RETURN v_feedback_id;
+END;
+$$;
@@ -0,0 +1,86 @@
+/*
+  # Per-tenant classification lexicons
+
+  1. New Tables
+    - `tenant_lexicon_entries` - phrases a tenant adds to (or removes from) one of the
+      built-in keyword categories used by the sentiment engine
+    - `tenant_lexicon_versions` - one counter per tenant, bumped on every entry change so
+      API workers can detect edits with a single primary-key lookup
+
+  2. Triggers
+    - `tenant_lexicon_entries_version` bumps the tenant's version after insert, update or delete
+
+  3. Security
+    - RLS enabled on both tables; tenant members can view and manage their tenant's lexicon
+*/
+
+CREATE TABLE IF NOT EXISTS tenant_lexicon_entries (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  tenant_id uuid REFERENCES tenants(id) ON DELETE CASCADE NOT NULL,
+  phrase text NOT NULL CHECK (length(trim(phrase)) > 0),
+  category text NOT NULL CHECK (category IN (
+    'positive', 'negative', 'urgency', 'intensifier', 'negation',
+    'complaint', 'praise', 'question', 'request'
+  )),
+  action text NOT NULL DEFAULT 'add' CHECK (action IN ('add', 'remove')),
+  created_by uuid REFERENCES users(id) ON DELETE SET NULL,
+  created_at timestamptz DEFAULT now(),
+  updated_at timestamptz DEFAULT now(),
+  UNIQUE(tenant_id, phrase, category)
+);
+
+CREATE TABLE IF NOT EXISTS tenant_lexicon_versions (
+  tenant_id uuid PRIMARY KEY REFERENCES tenants(id) ON DELETE CASCADE,
+  version bigint NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION bump_tenant_lexicon_version() RETURNS trigger AS $$
+BEGIN
+  INSERT INTO tenant_lexicon_versions AS v (tenant_id, version, updated_at)
+  VALUES (COALESCE(NEW.tenant_id, OLD.tenant_id), 1, now())
+  ON CONFLICT (tenant_id) DO UPDATE SET
+    version = v.version + 1,
+    updated_at = now();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS tenant_lexicon_entries_version ON tenant_lexicon_entries;
+
+CREATE TRIGGER tenant_lexicon_entries_version
+  AFTER INSERT OR UPDATE OR DELETE ON tenant_lexicon_entries
+  FOR EACH ROW EXECUTE FUNCTION bump_tenant_lexicon_version();
+
+ALTER TABLE tenant_lexicon_entries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE tenant_lexicon_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can view tenant lexicon"
+  ON tenant_lexicon_entries FOR SELECT
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
+
+CREATE POLICY "Members can manage tenant lexicon"
+  ON tenant_lexicon_entries FOR ALL
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
+
+CREATE POLICY "Members can view tenant lexicon version"
+  ON tenant_lexicon_versions FOR SELECT
+  TO authenticated
+  USING (
+    tenant_id IN (
+      SELECT tenant_id FROM tenant_memberships
+      WHERE user_id = auth.uid() AND is_active = true
+    )
+  );
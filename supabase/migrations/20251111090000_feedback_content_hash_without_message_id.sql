@@ -0,0 +1,23 @@
+/*
+  # Content-hash deduplication only for emails without a Message-ID
+
+  1. Indexes
+    - `idx_feedback_tenant_content_hash` becomes a partial unique index
+      (`WHERE message_id IS NULL`); emails with a Message-ID are deduplicated by
+      `idx_feedback_tenant_message_id` alone, so a customer repeating the same subject and
+      body in a new message is stored as new feedback instead of rejected with 409
+
+  2. Data
+    - `content_hash` is cleared on items that have a Message-ID; the API no longer sets it
+      for them
+*/
+
+DROP INDEX IF EXISTS idx_feedback_tenant_content_hash;
+
+UPDATE feedback_items
+SET content_hash = NULL
+WHERE message_id IS NOT NULL AND content_hash IS NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_tenant_content_hash
+  ON feedback_items(tenant_id, content_hash)
+  WHERE message_id IS NULL;
@@ -0,0 +1,127 @@
+/*
+  # Maintain feedback rollups with a trigger
+
+  1. Functions
+    - `feedback_rollup_delta(...)` - one row's +1/-1 contribution, in the shape
+      `apply_feedback_rollup_deltas` accepts
+    - `feedback_rollups_trigger()` - statement-level trigger body; counts inserted rows, moves
+      updated rows whose tenant, day, classification, status or satisfaction changed, and
+      removes deleted rows, with one `apply_feedback_rollup_deltas` call per statement
+    - `mark_feedback_satisfied` no longer adjusts rollups itself; the trigger does it
+
+  2. Triggers
+    - `feedback_items_rollups_insert`, `_update`, `_delete` on feedback_items, so rollups change
+      in the same transaction as the rows they count, whichever client writes them
+*/
+
+CREATE OR REPLACE FUNCTION feedback_rollup_delta(
+  p_tenant_id uuid,
+  p_created_at timestamptz,
+  p_sentiment text,
+  p_urgency text,
+  p_intent text,
+  p_status text,
+  p_is_satisfied boolean,
+  p_sign integer
+)
+RETURNS jsonb
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT jsonb_build_object(
+    'tenant_id', p_tenant_id,
+    'day', (p_created_at AT TIME ZONE 'UTC')::date,
+    'sentiment', COALESCE(p_sentiment, ''),
+    'urgency', COALESCE(p_urgency, ''),
+    'intent', COALESCE(p_intent, ''),
+    'item_count', p_sign,
+    'open_count', CASE WHEN p_status = 'open' THEN p_sign ELSE 0 END,
+    'satisfied_count', CASE WHEN p_is_satisfied THEN p_sign ELSE 0 END
+  );
+$$;
+
+CREATE OR REPLACE FUNCTION feedback_rollups_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM apply_feedback_rollup_deltas(jsonb_agg(feedback_rollup_delta(
+      n.tenant_id, n.created_at, n.sentiment, n.urgency, n.intent, n.status, n.is_satisfied, 1
+    )))
+    FROM new_rows n;
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM apply_feedback_rollup_deltas(jsonb_agg(feedback_rollup_delta(
+      o.tenant_id, o.created_at, o.sentiment, o.urgency, o.intent, o.status, o.is_satisfied, -1
+    )))
+    FROM old_rows o;
+  ELSE
+    PERFORM apply_feedback_rollup_deltas(jsonb_agg(c.delta))
+    FROM old_rows o
+    JOIN new_rows n ON n.id = o.id
+    CROSS JOIN LATERAL (VALUES
+      (feedback_rollup_delta(o.tenant_id, o.created_at, o.sentiment, o.urgency, o.intent, o.status, o.is_satisfied, -1)),
+      (feedback_rollup_delta(n.tenant_id, n.created_at, n.sentiment, n.urgency, n.intent, n.status, n.is_satisfied, 1))
+    ) AS c(delta)
+    WHERE (o.tenant_id, o.created_at, o.sentiment, o.urgency, o.intent, o.status, o.is_satisfied)
+      IS DISTINCT FROM (n.tenant_id, n.created_at, n.sentiment, n.urgency, n.intent, n.status, n.is_satisfied);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS feedback_items_rollups_insert ON feedback_items;
+CREATE TRIGGER feedback_items_rollups_insert
+  AFTER INSERT ON feedback_items
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feedback_rollups_trigger();
+
+DROP TRIGGER IF EXISTS feedback_items_rollups_update ON feedback_items;
+CREATE TRIGGER feedback_items_rollups_update
+  AFTER UPDATE ON feedback_items
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feedback_rollups_trigger();
+
+DROP TRIGGER IF EXISTS feedback_items_rollups_delete ON feedback_items;
+CREATE TRIGGER feedback_items_rollups_delete
+  AFTER DELETE ON feedback_items
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT EXECUTE FUNCTION feedback_rollups_trigger();
+
+CREATE OR REPLACE FUNCTION mark_feedback_satisfied(
+  p_tenant_id uuid,
+  p_user_id uuid,
+  p_feedback_ids uuid[],
+  p_note text DEFAULT NULL
+)
+RETURNS SETOF feedback_items
+LANGUAGE sql
+AS $$
+  WITH updated AS (
+    UPDATE feedback_items f SET
+      is_satisfied = true,
+      satisfied_at = now(),
+      satisfied_by = p_user_id,
+      status = 'closed',
+      updated_at = now()
+    WHERE f.tenant_id = p_tenant_id
+      AND f.id = ANY(p_feedback_ids)
+    RETURNING f.*
+  ),
+  comments AS (
+    INSERT INTO feedback_comments (feedback_id, user_id, comment, is_internal)
+    SELECT u.id, p_user_id, p_note, true
+    FROM updated u
+    WHERE COALESCE(p_note, '') <> ''
+  ),
+  audit AS (
+    INSERT INTO audit_logs (tenant_id, user_id, action, resource_type, resource_id, metadata)
+    SELECT p_tenant_id, p_user_id, 'feedback.satisfied', 'feedback', u.id,
+           jsonb_build_object('feedback_id', u.id)
+    FROM updated u
+  )
+  SELECT * FROM updated;
+$$;
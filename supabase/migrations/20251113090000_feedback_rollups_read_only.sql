@@ -0,0 +1,15 @@
+/*
+  # Make feedback rollups read-only for clients
+
+  1. Security
+    - Drop "Members can maintain tenant rollups"; members keep the SELECT policy only.
+      Rollups are written by the SECURITY DEFINER `feedback_rollups_trigger` on
+      feedback_items, so clients have no reason to write them
+    - Revoke EXECUTE on `apply_feedback_rollup_deltas` and `rebuild_feedback_daily_rollups`
+      from public, anon and authenticated; rebuilds run with the service role
+*/
+
+DROP POLICY IF EXISTS "Members can maintain tenant rollups" ON feedback_daily_rollups;
+
+REVOKE EXECUTE ON FUNCTION apply_feedback_rollup_deltas(jsonb) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION rebuild_feedback_daily_rollups(uuid, date) FROM PUBLIC, anon, authenticated;
@@ -7,6 +7,10 @@ export default defineConfig({
       '/api': {
         target: 'http://localhost:8000',
         changeOrigin: true
+      },
+      '/socket.io': {
+        target: 'http://localhost:8000',
+        ws: true
       }
     }
   }